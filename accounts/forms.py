@@ -1,8 +1,33 @@
+import logging
+
 from django import forms
 from django.contrib.auth import get_user_model
 from .models import Profile
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+def _sync_face_index(profile):
+    """
+    Keep the running face index in step with the profile's reference image.
+    Returns a warning for the admin when the new image could not be enrolled.
+    """
+    from accounts.services.faceREC.face import enroll_face, forget_face
+
+    username = profile.user.username
+    try:
+        enroll_face(username, profile.face_image.path, user=profile.user)
+    except Exception:
+        # لا نوقف حفظ الموظف إذا ما انكشف وجه في الصورة
+        logger.exception("Face enrollment failed for %s", username)
+        # the old embedding belongs to the replaced image: don't keep matching it
+        forget_face(username)
+        return (
+            f"No usable face was found in the new image for {username}. "
+            "Face verification is disabled for this employee until a clear face image is uploaded."
+        )
+    return None
 
 
 # -------------------------
@@ -52,6 +77,8 @@ class EmployeeCreateForm(forms.ModelForm):
     - password (set once)
     - profile fields: status, face_image
     """
+    face_warning = None  # set by save() when the face image could not be enrolled
+
     password = forms.CharField(
         widget=forms.PasswordInput(attrs={"class": "form-control"}),
         min_length=6,
@@ -107,6 +134,9 @@ class EmployeeCreateForm(forms.ModelForm):
                 profile.face_image = self.cleaned_data["face_image"]
             profile.save()
 
+            if self.cleaned_data.get("face_image"):
+                self.face_warning = _sync_face_index(profile)
+
         return user
 
 
@@ -115,6 +145,8 @@ class EmployeeUpdateForm(forms.ModelForm):
     Admin edits an existing employee + profile.
     Password is optional (reset).
     """
+    face_warning = None  # set by save() when the face image could not be enrolled
+
     password = forms.CharField(
         required=False,
         widget=forms.PasswordInput(attrs={"class": "form-control"}),
@@ -176,4 +208,7 @@ class EmployeeUpdateForm(forms.ModelForm):
                 self.profile.face_image = self.cleaned_data["face_image"]
             self.profile.save()
 
+            if self.cleaned_data.get("face_image"):
+                self.face_warning = _sync_face_index(self.profile)
+
         return user
@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from accounts.models import FaceStoreState, Profile
+from accounts.services.faceREC import model_service
+from accounts.services.faceREC.face import save_embedding
+from accounts.services.faceREC.index import normalize
+from accounts.services.faceREC.store import image_hash, load_store, save_store
+
+
+def _init_worker():
+    # each pool process loads the model once
+    model_service._warm_up()
+
+
+def _embed(path):
+    """
+    Runs inside a pool process: returns (vector, error).
+    """
+    try:
+        vec = normalize(model_service._represent_local(path))
+        return vec, None
+    except Exception as e:
+        return None, str(e)
+
+
+class Command(BaseCommand):
+    help = "Compute face embeddings for Profile.face_image into the on-disk face store"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=32)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Number of embedding processes (each loads its own model, ~1-2 GB RAM)"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Recompute every image even if unchanged"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        force = options["force"]
+
+        # workers apply every FaceEmbedding row newer than this on top of
+        # the snapshot, so nothing enrolled while we run is lost
+        self.generation = FaceStoreState.current_generation()
+
+        # current store -> {username: (vector, hash)}
+        rows = {}
+        store = load_store(mmap=False)
+        if store is not None and not force:
+            ids, matrix, meta = store
+            hashes = meta.get("hashes") or {}
+            for i, key in enumerate(ids):
+                rows[key] = (matrix[i], hashes.get(key, ""))
+
+        profiles = (
+            Profile.objects
+            .select_related("user")
+            .exclude(face_image="")
+            .exclude(face_image__isnull=True)
+        )
+
+        pending = []
+        seen = set()
+        users = {}
+        for profile in profiles:
+            key = profile.user.username
+            users[key] = profile.user
+            path = profile.face_image.path
+            if not os.path.exists(path):
+                self.stdout.write(self.style.WARNING(f"Missing image for {key}: {path}"))
+                continue
+
+            seen.add(key)
+            digest = image_hash(path)
+            if key in rows and rows[key][1] == digest:
+                continue
+            pending.append((key, path, digest))
+
+        stale = [k for k in rows if k not in seen]
+        for key in stale:
+            del rows[key]
+            save_embedding(key, None)
+
+        self.stdout.write(
+            f"Profiles with faces: {len(seen)} | to embed: {len(pending)} | removed: {len(stale)}"
+        )
+
+        if not pending:
+            if stale:
+                self._save(rows)
+            self.stdout.write(self.style.SUCCESS("Face store is up to date ✅"))
+            return
+
+        done = 0
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=_init_worker) as pool:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                results = pool.map(_embed, [path for _, path, _ in batch])
+
+                for (key, _, digest), (vec, error) in zip(batch, results):
+                    if vec is None:
+                        failed += 1
+                        self.stdout.write(self.style.ERROR(f"{key}: {error}"))
+                        continue
+                    rows[key] = (vec, digest)
+                    save_embedding(key, vec, user=users[key], image_hash=digest)
+                    done += 1
+
+                # checkpoint after every batch (rerun resumes from here)
+                self._save(rows)
+                self.stdout.write(f"Embedded {done}/{len(pending)}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Enrolment completed ✅ (Embedded: {done}, Failed: {failed}, Total: {len(rows)})"
+            )
+        )
+
+    def _save(self, rows):
+        ids = sorted(rows)
+        if ids:
+            matrix = np.vstack([rows[k][0] for k in ids])
+        else:
+            matrix = np.empty((0, 512), dtype=np.float32)
+        save_store(ids, matrix, {k: rows[k][1] for k in ids}, generation=self.generation)
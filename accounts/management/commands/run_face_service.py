@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from accounts.services.faceREC import model_service
+
+
+class Command(BaseCommand):
+    help = "Run the warm face-inference service used by all web workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--socket",
+            type=str,
+            default="",
+            help="Unix socket path (default: settings.FACE_SERVICE_SOCKET)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model_service.serve(options["socket"] or None, log=self.stdout.write)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Face service stopped"))
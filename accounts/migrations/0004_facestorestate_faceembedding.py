@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-17 09:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_profile_created_at_profile_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FaceStoreState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FaceEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=150, unique=True)),
+                ('vector', models.BinaryField(blank=True, null=True)),
+                ('image_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('generation', models.PositiveBigIntegerField(db_index=True, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='face_embeddings', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
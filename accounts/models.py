@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 
@@ -47,6 +48,53 @@ class Profile(models.Model):
         return f"{self.user.username} ({self.status})"
 
 
+class FaceStoreState(models.Model):
+    """
+    Single-row counter for the face embedding store.
+    Every enrolment/removal takes the next generation number.
+    """
+    generation = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def next_generation(cls):
+        with transaction.atomic():
+            state, _ = cls.objects.select_for_update().get_or_create(pk=1)
+            state.generation = F("generation") + 1
+            state.save(update_fields=["generation"])
+            state.refresh_from_db(fields=["generation"])
+        return state.generation
+
+    @classmethod
+    def current_generation(cls):
+        return cls.objects.filter(pk=1).values_list("generation", flat=True).first() or 0
+
+
+class FaceEmbedding(models.Model):
+    """
+    Reference face embedding for one identity (key = username).
+    Running workers reload only rows with a generation newer than theirs.
+    """
+    key = models.CharField(max_length=150, unique=True)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="face_embeddings"
+    )
+
+    # float32 bytes (L2-normalized); NULL = identity removed
+    vector = models.BinaryField(null=True, blank=True)
+    image_hash = models.CharField(max_length=64, blank=True, default="")
+
+    generation = models.PositiveBigIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Face embedding — {self.key} (gen {self.generation})"
+
+
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_profile_for_user(sender, instance, created, **kwargs):
     """
@@ -54,3 +102,15 @@ def create_profile_for_user(sender, instance, created, **kwargs):
     """
     if created:
         Profile.objects.create(user=instance)
+
+
+@receiver(post_delete, sender=Profile)
+def remove_face_for_profile(sender, instance, **kwargs):
+    """
+    Drop the deleted employee from the running face index.
+    """
+    if not instance.face_image:
+        return
+
+    from accounts.services.faceREC.face import forget_face
+    forget_face(instance.user.username)
@@ -12,38 +12,139 @@ Original file is located at
 # face.py
 
 from pathlib import Path
-from deepface import DeepFace
-from scipy.spatial.distance import cosine
 import pickle
+import threading
+
+import numpy as np
+
+from . import model_service
+from .index import FaceIndex, normalize
+from .store import image_hash, load_store
 
 THRESHOLD = 0.68
 
 # تحديد مسار الملف الحالي
 BASE_DIR = Path(__file__).resolve().parent
 
-# تحميل قاعدة بيانات الوجوه
-with open(BASE_DIR / "face_embeddings.pkl", "rb") as f:
-    FACE_DB = pickle.load(f)
 
-def verify_face(image_path: str, authorized_users: list):
+def _load_index():
+    """
+    Prefer the store written by `manage.py enroll_faces` (memory-mapped,
+    so all workers share the same pages through the OS page cache);
+    fall back to the legacy pickle from the Colab notebook.
+    """
+    store = load_store()
+    if store is not None:
+        ids, matrix, meta = store
+        index = FaceIndex.from_matrix(ids, matrix)
+        index.generation = int(meta.get("generation") or 0)
+        return index
+
+    with open(BASE_DIR / "face_embeddings.pkl", "rb") as f:
+        return FaceIndex.from_dict(pickle.load(f))
+
+
+def _apply_changes(index: FaceIndex):
+    """
+    Apply FaceEmbedding rows newer than the index generation
+    (uploads made by admins / other workers since we loaded).
+    One indexed query; returns nothing when the index is current.
+    """
+    from accounts.models import FaceEmbedding
+
+    rows = (
+        FaceEmbedding.objects
+        .filter(generation__gt=index.generation)
+        .order_by("generation")
+        .values_list("key", "vector", "generation")
+    )
+    for key, vector, generation in rows:
+        if vector is None:
+            index.remove(key)
+        else:
+            index.add(key, np.frombuffer(vector, dtype=np.float32))
+        index.generation = max(index.generation, generation)
+
+
+# مصفوفة الوجوه (normalized) للبحث بعملية ضرب واحدة
+# تُحمّل عند أول تحقق فقط (مو وقت الـ import) عشان migrate/check ما يتأثرون
+_FACE_INDEX = None
+_INDEX_LOCK = threading.RLock()
+
+
+def get_index() -> FaceIndex:
+    """
+    Return the worker's index, brought up to the latest generation.
+    Callers that read it should hold _INDEX_LOCK.
     """
-    image_path: path to image
-    authorized_users: list of user names or IDs
+    global _FACE_INDEX
+    with _INDEX_LOCK:
+        if _FACE_INDEX is None:
+            _FACE_INDEX = _load_index()
+        _apply_changes(_FACE_INDEX)
+        return _FACE_INDEX
+
+
+def save_embedding(user_key: str, vector, user=None, image_hash: str = ""):
     """
+    Persist one identity under a new generation (vector=None removes it).
+    """
+    from accounts.models import FaceEmbedding, FaceStoreState
+
+    defaults = {
+        "vector": None if vector is None else normalize(vector).tobytes(),
+        "image_hash": image_hash,
+        "generation": FaceStoreState.next_generation(),
+    }
+    if user is not None:
+        defaults["user"] = user
 
-    embedding = DeepFace.represent(
-        img_path=image_path,
-        model_name="ArcFace",
-        enforce_detection=True
-    )[0]["embedding"]
+    FaceEmbedding.objects.update_or_create(key=user_key, defaults=defaults)
 
-    for user in authorized_users:
-        stored_embedding = FACE_DB.get(user)
-        if stored_embedding is None:
-            continue
 
-        similarity = 1 - cosine(embedding, stored_embedding)
+def represent(image):
+    """
+    image: BGR numpy array (see images.py) or path to an image file
+    """
+    # warm shared model (run_face_service) or in-process fallback
+    return model_service.represent(image)
+
+
+def enroll_face(user_key: str, image_path: str, user=None):
+    """
+    Compute and store the reference embedding for one identity
+    (called when an employee's face image changes). Other workers pick
+    it up on their next verification through the generation counter.
+    """
+    embedding = represent(image_path)
+    save_embedding(user_key, embedding, user=user, image_hash=image_hash(image_path))
+    return embedding
 
+
+def forget_face(user_key: str):
+    save_embedding(user_key, None)
+
+
+def identify_face(image, authorized_users=None, k: int = 1):
+    """
+    Return the top-k (user, similarity) matches for the image.
+    authorized_users: optional list restricting the candidates.
+    """
+    embedding = represent(image)
+    with _INDEX_LOCK:
+        return get_index().search(embedding, k=k, candidates=authorized_users)
+
+
+def verify_face(image, authorized_users: list = None):
+    """
+    image: BGR numpy array (decoded in memory) or path to image
+    authorized_users: list of user names or IDs (None = all enrolled faces)
+    """
+
+    matches = identify_face(image, authorized_users, k=1)
+
+    if matches:
+        user, similarity = matches[0]
         if similarity >= THRESHOLD:
             return {
                 "approved": True,
@@ -56,3 +157,40 @@ def verify_face(image_path: str, authorized_users: list):
         "user": None,
         "confidence": 0.0
     }
+
+
+def identity_key(user) -> str:
+    """
+    Embedding id for a User (enrolment stores faces under the username).
+    """
+    return user.get_username()
+
+
+def verify_user_face(image, user):
+    """
+    1:1 check: is the person in the image the given (logged-in) user?
+    Compares against that user's stored embedding only.
+    """
+    key = identity_key(user)
+
+    with _INDEX_LOCK:
+        reference = get_index().get(key)
+        if reference is not None:
+            reference = np.array(reference, dtype=np.float32)
+
+    if reference is None:
+        return {
+            "approved": False,
+            "user": key,
+            "confidence": 0.0,
+            "message": "No reference face enrolled for this user."
+        }
+
+    similarity = float(reference @ normalize(represent(image)))
+    approved = similarity >= THRESHOLD
+
+    return {
+        "approved": approved,
+        "user": key,
+        "confidence": round(similarity, 2) if approved else 0.0
+    }
@@ -0,0 +1,63 @@
+# images.py
+"""
+Decode camera frames / uploads straight into NumPy arrays (no temp files).
+"""
+
+import base64
+import binascii
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Longest side handed to the detector; larger frames are downscaled first.
+MAX_SIDE = 640
+
+
+def decode_image(raw: bytes, max_side: int = MAX_SIDE) -> np.ndarray:
+    """
+    bytes -> BGR uint8 array (the layout DeepFace/OpenCV expect).
+    Raises ValueError for anything that is not a readable image.
+    """
+    try:
+        img = Image.open(BytesIO(raw))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGB")
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError("Invalid image format.") from e
+
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.BILINEAR)
+
+    rgb = np.asarray(img, dtype=np.uint8)
+    return np.ascontiguousarray(rgb[:, :, ::-1])
+
+
+def decode_data_url(data_url: str, max_side: int = MAX_SIDE) -> np.ndarray:
+    """
+    "data:image/jpeg;base64,..." (camera canvas) -> BGR array.
+    """
+    try:
+        _, encoded = data_url.split(",", 1)
+        raw = base64.b64decode(encoded)
+    except (ValueError, binascii.Error) as e:
+        raise ValueError("Invalid image format.") from e
+
+    return decode_image(raw, max_side=max_side)
+
+
+def load_upload(uploaded_file, max_side: int = MAX_SIDE) -> np.ndarray:
+    """
+    Django UploadedFile (multipart) -> BGR array.
+    """
+    raw = b"".join(uploaded_file.chunks())
+    return decode_image(raw, max_side=max_side)
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 90) -> bytes:
+    """
+    BGR array -> JPEG bytes (used to queue an already-downscaled frame).
+    """
+    buf = BytesIO()
+    Image.fromarray(np.ascontiguousarray(image[:, :, ::-1])).save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
@@ -0,0 +1,143 @@
+# index.py
+
+import numpy as np
+
+
+def normalize(embedding) -> np.ndarray:
+    """
+    Return a float32 unit vector for a single embedding.
+    """
+    vec = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = vec / norm
+    return vec
+
+
+class FaceIndex:
+    """
+    In-memory face-embedding index.
+
+    - Rows are L2-normalized float32 vectors in one contiguous matrix,
+      so cosine similarity against every identity is a single
+      matrix-vector product.
+    - `ids[i]` is the identity key (username) of row i.
+    - `generation` is the newest FaceStoreState generation applied.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.generation = 0
+        self.ids = []
+        self._positions = {}
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+
+    @classmethod
+    def from_dict(cls, face_db: dict, dim: int = 512):
+        index = cls(dim=dim)
+        if not face_db:
+            return index
+
+        keys = list(face_db.keys())
+        matrix = np.asarray([face_db[k] for k in keys], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        index.dim = matrix.shape[1]
+        index.matrix = np.ascontiguousarray(matrix / norms)
+        index.ids = keys
+        index._positions = {k: i for i, k in enumerate(keys)}
+        return index
+
+    @classmethod
+    def from_matrix(cls, ids, matrix):
+        """
+        Wrap an already-normalized float32 matrix (e.g. the memory-mapped
+        face store) without copying it.
+        """
+        index = cls(dim=matrix.shape[1])
+        index.matrix = matrix
+        index.ids = list(ids)
+        index._positions = {k: i for i, k in enumerate(index.ids)}
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def get(self, key):
+        """
+        Stored (normalized) vector for `key`, or None.
+        """
+        pos = self._positions.get(key)
+        if pos is None:
+            return None
+        return self.matrix[pos]
+
+    def add(self, key, embedding):
+        """
+        Add or replace the embedding stored for `key`.
+        """
+        vec = normalize(embedding)
+
+        pos = self._positions.get(key)
+        if pos is not None:
+            if not self.matrix.flags.writeable:
+                # read-only store (memory-mapped): copy on first write
+                self.matrix = np.array(self.matrix, dtype=np.float32)
+            self.matrix[pos] = vec
+            return
+
+        self.matrix = np.ascontiguousarray(np.vstack([self.matrix, vec[None, :]]))
+        self._positions[key] = len(self.ids)
+        self.ids.append(key)
+
+    def remove(self, key):
+        pos = self._positions.pop(key, None)
+        if pos is None:
+            return False
+
+        self.matrix = np.ascontiguousarray(np.delete(self.matrix, pos, axis=0))
+        del self.ids[pos]
+        for i in range(pos, len(self.ids)):
+            self._positions[self.ids[i]] = i
+        return True
+
+    def search(self, embedding, k: int = 1, candidates=None):
+        """
+        Return up to k (key, similarity) pairs, best first.
+        candidates: optional iterable of keys to restrict the search to.
+        """
+        if not self.ids:
+            return []
+
+        query = normalize(embedding)
+
+        if candidates is None:
+            rows = None
+            matrix = self.matrix
+        else:
+            rows = np.fromiter(
+                (self._positions[c] for c in candidates if c in self._positions),
+                dtype=np.intp,
+            )
+            if rows.size == 0:
+                return []
+            matrix = self.matrix[rows]
+
+        scores = matrix @ query
+
+        k = min(k, scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            pos = int(i) if rows is None else int(rows[i])
+            results.append((self.ids[pos], float(scores[i])))
+        return results
@@ -0,0 +1,195 @@
+# model_service.py
+"""
+Warm ArcFace inference shared by all web workers.
+
+- `manage.py run_face_service` starts one long-lived process that loads
+  the model once and listens on a Unix socket (settings.FACE_SERVICE_SOCKET).
+- Requests from all workers are queued and run one at a time on the warm
+  model (DeepFace detects and embeds per image, so there is no batched pass).
+- `represent()` / `verify()` talk to that process; if it is not running
+  (or dies mid-call) they fall back to in-process DeepFace (old behaviour).
+"""
+
+import os
+import queue
+import threading
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+MODEL_NAME = "ArcFace"
+
+
+def _socket_path():
+    from django.conf import settings
+    return getattr(settings, "FACE_SERVICE_SOCKET", "")
+
+
+def _authkey():
+    from django.conf import settings
+    return settings.SECRET_KEY.encode("utf-8")
+
+
+# -------------------------
+# Local inference
+# -------------------------
+def _represent_local(image):
+    from deepface import DeepFace
+
+    return DeepFace.represent(
+        img_path=image,
+        model_name=MODEL_NAME,
+        enforce_detection=True
+    )[0]["embedding"]
+
+
+def _warm_up():
+    from deepface import DeepFace
+
+    try:
+        DeepFace.build_model(MODEL_NAME)
+    except TypeError:
+        # deepface >= 0.0.90
+        DeepFace.build_model(task="facial_recognition", model_name=MODEL_NAME)
+
+
+# -------------------------
+# Client
+# -------------------------
+class FaceServiceError(Exception):
+    pass
+
+
+def _call(op, payload):
+    path = _socket_path()
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        conn = Client(path, family="AF_UNIX", authkey=_authkey())
+    except (OSError, EOFError):
+        return None
+
+    try:
+        conn.send((op, payload))
+        ok, result = conn.recv()
+    except (OSError, EOFError):
+        # service died / restarted mid-call: caller runs the model in-process
+        return None
+    finally:
+        conn.close()
+
+    if not ok:
+        raise FaceServiceError(result)
+    return result
+
+
+def represent(image):
+    """
+    Return the ArcFace embedding (list of floats) for one image.
+    Raises ValueError when no face is detected (same as DeepFace).
+    """
+    try:
+        result = _call("represent", image)
+    except FaceServiceError as e:
+        raise ValueError(str(e))
+
+    if result is None:
+        result = _represent_local(image)
+    return result
+
+
+def similarity(emb1, emb2) -> float:
+    a = np.asarray(emb1, dtype=np.float32)
+    b = np.asarray(emb2, dtype=np.float32)
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if denom == 0:
+        return 0.0
+    return float(a @ b) / denom
+
+
+def verify(image1, image2, threshold: float):
+    """
+    1:1 comparison of two images on the shared model.
+    """
+    score = similarity(represent(image1), represent(image2))
+    return {
+        "verified": score >= threshold,
+        "similarity": score,
+    }
+
+
+# -------------------------
+# Server
+# -------------------------
+class _Job:
+    __slots__ = ("image", "done", "ok", "result")
+
+    def __init__(self, image):
+        self.image = image
+        self.done = threading.Event()
+        self.ok = False
+        self.result = None
+
+
+def _worker_loop(jobs: queue.Queue):
+    # one model, one inference at a time
+    while True:
+        job = jobs.get()
+        try:
+            job.result = _represent_local(job.image)
+            job.ok = True
+        except Exception as e:
+            job.result = str(e)
+        job.done.set()
+
+
+def _handle(conn, jobs: queue.Queue):
+    try:
+        while True:
+            try:
+                op, payload = conn.recv()
+            except EOFError:
+                return
+
+            if op != "represent":
+                conn.send((False, f"Unknown operation: {op}"))
+                continue
+
+            job = _Job(payload)
+            jobs.put(job)
+            job.done.wait()
+            conn.send((job.ok, job.result))
+    finally:
+        conn.close()
+
+
+def serve(path=None, log=print):
+    """
+    Load the model once and answer requests until interrupted.
+    """
+    path = path or _socket_path()
+    if os.path.exists(path):
+        os.remove(path)
+
+    log(f"Loading {MODEL_NAME} ...")
+    _warm_up()
+
+    jobs = queue.Queue()
+    threading.Thread(target=_worker_loop, args=(jobs,), daemon=True).start()
+
+    listener = Listener(path, family="AF_UNIX", authkey=_authkey())
+    log(f"Face service listening on {path}")
+
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception:
+                # failed handshake (wrong authkey / client went away)
+                continue
+            threading.Thread(target=_handle, args=(conn, jobs), daemon=True).start()
+    finally:
+        listener.close()
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,114 @@
+# quality.py
+"""
+Cheap frame checks that run before the embedding model.
+
+Rejects dark / over-exposed / blurry frames and frames without a
+usable face in a few milliseconds, and returns hints for the user.
+"""
+
+import threading
+
+import numpy as np
+
+MIN_BRIGHTNESS = 40.0
+MAX_BRIGHTNESS = 220.0
+MIN_SHARPNESS = 25.0      # variance of the Laplacian
+MIN_FACE_RATIO = 0.15     # face width / frame width
+DETECT_WIDTH = 320        # detector runs on a downscaled copy
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def _get_detector():
+    """
+    OpenCV Haar cascade (fast, CPU-only). None if OpenCV (4.x) is
+    missing, in which case the face check is left to the embedding model.
+    """
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                try:
+                    import cv2
+                except ImportError:
+                    cv2 = None
+
+                if cv2 is None or not hasattr(cv2, "CascadeClassifier"):
+                    _detector = False
+                else:
+                    path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+                    _detector = cv2.CascadeClassifier(path)
+    return _detector or None
+
+
+def _gray(image: np.ndarray) -> np.ndarray:
+    # BGR -> luminance
+    img = image.astype(np.float32)
+    return 0.114 * img[:, :, 0] + 0.587 * img[:, :, 1] + 0.299 * img[:, :, 2]
+
+
+def _sharpness(gray: np.ndarray) -> float:
+    lap = (
+        -4.0 * gray[1:-1, 1:-1]
+        + gray[:-2, 1:-1] + gray[2:, 1:-1]
+        + gray[1:-1, :-2] + gray[1:-1, 2:]
+    )
+    return float(lap.var())
+
+
+def check_frame(image: np.ndarray) -> dict:
+    """
+    image: BGR uint8 array (see images.py)
+    Returns {"ok": bool, "hints": [str], "scores": {...}}
+    """
+    hints = []
+    gray = _gray(image)
+
+    brightness = float(gray.mean())
+    sharpness = _sharpness(gray)
+    scores = {
+        "brightness": round(brightness, 1),
+        "sharpness": round(sharpness, 1),
+    }
+
+    if brightness < MIN_BRIGHTNESS:
+        hints.append("The image is too dark. Turn on a light or face a window.")
+    elif brightness > MAX_BRIGHTNESS:
+        hints.append("The image is too bright. Avoid direct light behind or on the camera.")
+
+    if sharpness < MIN_SHARPNESS:
+        hints.append("The image is blurry. Hold still and make sure the camera is in focus.")
+
+    detector = _get_detector()
+    if detector is not None and not hints:
+        import cv2
+
+        small = gray.astype(np.uint8)
+        if small.shape[1] > DETECT_WIDTH:
+            scale = DETECT_WIDTH / small.shape[1]
+            small = cv2.resize(small, (DETECT_WIDTH, int(small.shape[0] * scale)))
+
+        # faces smaller than MIN_FACE_RATIO are rejected anyway
+        min_side = max(24, int(small.shape[1] * MIN_FACE_RATIO * 0.8))
+        faces = detector.detectMultiScale(
+            small,
+            scaleFactor=1.15,
+            minNeighbors=3,
+            minSize=(min_side, min_side),
+        )
+        scores["faces"] = len(faces)
+
+        if len(faces) == 0:
+            hints.append("No face detected. Look straight at the camera and move a little closer.")
+        else:
+            face_ratio = max(float(f[2]) for f in faces) / small.shape[1]
+            scores["face_ratio"] = round(face_ratio, 2)
+            if face_ratio < MIN_FACE_RATIO:
+                hints.append("Your face is too small. Move closer to the camera.")
+
+    return {
+        "ok": not hints,
+        "hints": hints,
+        "scores": scores,
+    }
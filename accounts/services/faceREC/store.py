@@ -0,0 +1,103 @@
+# store.py
+"""
+On-disk face-embedding store (written by `manage.py enroll_faces`).
+
+- face_store/m<seq>.npy : float32 matrix, one L2-normalized row per identity
+                          (never rewritten: every save gets a new file)
+- face_embeddings.json  : sidecar {version, model, dim, generation, ids, hashes, matrix}
+
+The sidecar names the matrix file its ids belong to, so replacing the
+sidecar (one os.replace) swaps ids and matrix together: a worker loading
+during a save sees either the old pair or the new one, never a mix.
+The .npy file is memory-mappable, so workers can share its pages.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+STORE_VERSION = 2
+MODEL_NAME = "ArcFace"
+
+BASE_DIR = Path(__file__).resolve().parent
+MATRIX_DIR = BASE_DIR / "face_store"
+META_PATH = BASE_DIR / "face_embeddings.json"
+
+
+def image_hash(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_store(mmap: bool = True):
+    """
+    Return (ids, matrix, meta) or None if there is no usable store.
+    """
+    if not META_PATH.exists():
+        return None
+
+    with open(META_PATH, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta.get("version") != STORE_VERSION or meta.get("model") != MODEL_NAME:
+        return None
+
+    try:
+        matrix = np.load(MATRIX_DIR / meta["matrix"], mmap_mode="r" if mmap else None)
+    except (KeyError, OSError, ValueError):
+        return None
+    ids = meta.get("ids") or []
+    if matrix.shape[0] != len(ids):
+        return None
+
+    return ids, matrix, meta
+
+
+def save_store(ids, matrix, hashes: dict, generation: int = 0):
+    """
+    Atomically replace the store: write a new matrix file, then swap the
+    sidecar that points to it.
+    generation: FaceStoreState generation the snapshot is complete up to.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    MATRIX_DIR.mkdir(parents=True, exist_ok=True)
+
+    previous = None
+    if META_PATH.exists():
+        with open(META_PATH, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("matrix")
+
+    seq = 1 + max((int(p.stem[1:]) for p in MATRIX_DIR.glob("m*.npy") if p.stem[1:].isdigit()), default=0)
+    name = f"m{seq:06d}.npy"
+    tmp_matrix = MATRIX_DIR / f"{name}.tmp"
+    with open(tmp_matrix, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_matrix, MATRIX_DIR / name)
+
+    meta = {
+        "version": STORE_VERSION,
+        "model": MODEL_NAME,
+        "dim": int(matrix.shape[1]),
+        "generation": int(generation),
+        "matrix": name,
+        "ids": list(ids),
+        "hashes": {k: hashes[k] for k in ids if k in hashes},
+    }
+    tmp_meta = META_PATH.with_suffix(".json.tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_meta, META_PATH)
+
+    # keep the previous matrix for workers that still map it
+    for old in MATRIX_DIR.glob("m*.npy"):
+        if old.name not in (name, previous):
+            try:
+                old.unlink()
+            except OSError:
+                pass
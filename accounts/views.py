@@ -2,16 +2,14 @@ from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.http import HttpResponseForbidden
 from django.shortcuts import render, redirect
-from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.contrib import messages
 from .forms import EmployeeCreateForm, EmployeeUpdateForm
 
-import os
-import uuid
-
 from .models import Profile
-from accounts.services.faceREC.face import verify_face, FACE_DB
+from accounts.services.faceREC.face import verify_user_face
+from accounts.services.faceREC.images import load_upload
+from accounts.services.faceREC.quality import check_frame
 
 User = get_user_model()
 
@@ -161,28 +159,29 @@ def face_verify(request):
     if request.method == "POST" and request.FILES.get("face_image"):
         img = request.FILES["face_image"]
 
-        temp_dir = os.path.join(settings.MEDIA_ROOT, "temp")
-        os.makedirs(temp_dir, exist_ok=True)
-
-        filename = f"{uuid.uuid4().hex}_{img.name}"
-        temp_path = os.path.join(temp_dir, filename)
-
-        with open(temp_path, "wb+") as f:
-            for chunk in img.chunks():
-                f.write(chunk)
-
-        # Current behavior: allow comparison against FACE_DB identities
-        authorized = list(FACE_DB.keys())
-        result = verify_face(temp_path, authorized)
-
         try:
-            os.remove(temp_path)
-        except Exception:
-            pass
+            # decoded in memory (no temp file under MEDIA_ROOT)
+            image = load_upload(img)
+            quality = check_frame(image)
+            if quality["ok"]:
+                # 1:1 against the logged-in user's own reference face
+                result = verify_user_face(image, request.user)
+            else:
+                result = {
+                    "approved": False,
+                    "user": None,
+                    "confidence": 0.0,
+                    "message": " ".join(quality["hints"]),
+                }
+        except ValueError as e:
+            result = {"approved": False, "user": None, "confidence": 0.0, "message": str(e)}
 
         if result and result.get("approved"):
             request.session["face_verified"] = True
 
+            from meetings.services.face_cache import remember
+            remember(request, result.get("confidence"))
+
     return render(request, "accounts/face_verify.html", {"result": result})
 
 @admin_required
@@ -192,6 +191,8 @@ def employee_create(request):
         if form.is_valid():
             user = form.save()
             messages.success(request, f"Employee created: {user.username}")
+            if form.face_warning:
+                messages.warning(request, form.face_warning)
             return redirect("accounts:employee_list")
     else:
         form = EmployeeCreateForm()
@@ -209,6 +210,8 @@ def employee_edit(request, pk):
         if form.is_valid():
             form.save()
             messages.success(request, f"Employee updated: {user.username}")
+            if form.face_warning:
+                messages.warning(request, form.face_warning)
             return redirect("accounts:employee_list")
     else:
         form = EmployeeUpdateForm(instance=user, profile=profile)
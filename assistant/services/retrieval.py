@@ -0,0 +1,191 @@
+"""
+Knowledge retrieval for the WARF assistant.
+
+settings.ASSISTANT_RETRIEVER:
+- "lexical": BM25 over chunk text + document title (records.services.search_index)
+- "dense"  : embeddings + IVF index (records.services.vector_index)
+- "hybrid" : both at the same time (the dense side in a pool thread), fused
+             with reciprocal rank fusion. BM25 catches exact tokens such as
+             meeting UUIDs; embeddings catch paraphrases.
+
+The fused top candidates are optionally rescored by a cross-encoder
+(settings.ASSISTANT_RERANK_MODEL). Every stage is timed (ms); a dense stage
+that fails is reported as timings["dense_error"] and the answer falls back
+to the lexical results.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Q
+
+from records.models import KnowledgeChunk
+from records.services import embeddings, search_index, vector_index
+
+RRF_K = 60                # reciprocal rank fusion constant
+CANDIDATES_PER_K = 4      # each retriever returns k * this candidates (room for fusion / deleted chunks)
+RERANK_CANDIDATES = 20    # fused candidates rescored by the cross-encoder
+RERANK_MAX_CHARS = 2000   # chunk text sent to the cross-encoder
+SNIPPET_CHARS = 650
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="assistant-retrieval")
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+# -------------------------
+# Retrievers: [(chunk_id, score, snippet or None)] best first
+# -------------------------
+def _like_search(query: str, k: int):
+    """
+    Fallback when the full-text index is unavailable: icontains scan, newest first.
+    """
+    keywords = search_index.query_terms(query)
+
+    # لو ما طلع keywords، نستخدم النص كامل
+    if not keywords:
+        qtext = (query or "").lower().strip()
+        keywords = [qtext] if qtext else []
+    if not keywords:
+        return []
+
+    # Q OR على كل كلمة
+    q_obj = Q()
+    for kw in keywords[:6]:  # حد بسيط
+        q_obj |= Q(text__icontains=kw) | Q(document__title__icontains=kw)
+
+    ids = KnowledgeChunk.objects.filter(q_obj).order_by("-created_at").values_list("id", flat=True)[:k]
+    return [(cid, None, None) for cid in ids]
+
+
+def lexical_search(query: str, k: int):
+    try:
+        return search_index.search(query, k=k)
+    except DatabaseError:
+        return _like_search(query, k)
+
+
+def dense_search(query: str, k: int):
+    """
+    None when there is no usable vector index (not built yet / built with
+    another model / sentence-transformers not installed on this worker).
+    No database access: safe to run in a pool thread.
+    """
+    index = vector_index.get_index()
+    if index is None or not (query or "").strip():
+        return None
+
+    try:
+        encoder = embeddings.get_encoder()
+    except ImportError:
+        return None
+    if encoder.name != index.model:
+        return None
+
+    return [(cid, score, None) for cid, score in index.search(encoder.encode([query])[0], k=k)]
+
+
+def reciprocal_rank_fusion(rankings: dict, rrf_k: int = RRF_K):
+    """
+    rankings: {retriever: [(chunk_id, score, snippet)]}.
+    Returns [(chunk_id, fused score, snippet, {retriever: rank})] best first.
+    """
+    fused = {}
+    for name, hits in rankings.items():
+        for rank, (cid, _, snippet) in enumerate(hits, start=1):
+            entry = fused.setdefault(cid, [0.0, None, {}])
+            entry[0] += 1.0 / (rrf_k + rank)
+            entry[1] = entry[1] or snippet
+            entry[2][name] = rank
+    ordered = sorted(fused.items(), key=lambda item: item[1][0], reverse=True)
+    return [(cid, score, snippet, ranks) for cid, (score, snippet, ranks) in ordered]
+
+
+# -------------------------
+# Entry point
+# -------------------------
+def retrieve_chunks(query: str, k: int = 5, timings: dict = None):
+    """
+    Most relevant chunks first. `timings` (optional dict) receives the
+    duration of every stage in ms.
+    """
+    timings = timings if timings is not None else {}
+    started = time.perf_counter()
+    mode = settings.ASSISTANT_RETRIEVER
+    depth = k * CANDIDATES_PER_K
+
+    dense_future = None
+    if mode in ("dense", "hybrid"):
+        def timed_dense():
+            t = time.perf_counter()
+            hits = dense_search(query, depth)
+            return hits, _ms(t)
+        dense_future = _executor.submit(timed_dense)
+
+    rankings = {}
+    if mode != "dense":
+        t = time.perf_counter()
+        rankings["lexical"] = lexical_search(query, depth)
+        timings["lexical"] = _ms(t)
+
+    if dense_future is not None:
+        try:
+            hits, timings["dense"] = dense_future.result()
+        except Exception as e:
+            # broken index / model: answer from the lexical side
+            hits = None
+            timings["dense_error"] = f"{e.__class__.__name__}: {e}"[:200]
+        if hits is not None:
+            rankings["dense"] = hits
+        elif "lexical" not in rankings:
+            # no (usable) vector index
+            t = time.perf_counter()
+            rankings["lexical"] = lexical_search(query, depth)
+            timings["lexical"] = _ms(t)
+
+    t = time.perf_counter()
+    if len(rankings) > 1:
+        candidates = reciprocal_rank_fusion(rankings)
+    else:
+        name, hits = next(iter(rankings.items()))
+        candidates = [(cid, score, snippet, {name: rank}) for rank, (cid, score, snippet) in enumerate(hits, start=1)]
+    timings["fusion"] = _ms(t)
+
+    try:
+        reranker = embeddings.get_reranker()
+    except ImportError:
+        reranker = None
+
+    t = time.perf_counter()
+    limit = RERANK_CANDIDATES if reranker is not None else k
+    # over-fetch: chunks deleted since the index was built are skipped and
+    # the next candidates take their place
+    fetch = candidates[:max(limit, depth)]
+    chunks = KnowledgeChunk.objects.select_related("document").in_bulk([c[0] for c in fetch])
+    candidates = [c for c in fetch if c[0] in chunks][:limit]
+    timings["fetch"] = _ms(t)
+
+    if reranker is not None and candidates:
+        t = time.perf_counter()
+        scores = reranker.score(query, [chunks[c[0]].text[:RERANK_MAX_CHARS] for c in candidates])
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)[:k]
+        candidates = [(candidates[i][0], float(scores[i]), candidates[i][2], candidates[i][3]) for i in order]
+        timings["rerank"] = _ms(t)
+
+    results = []
+    for cid, score, snippet, ranks in candidates[:k]:
+        ch = chunks[cid]
+        results.append({
+            "title": ch.document.title,
+            "doc_type": ch.document.doc_type,
+            "meeting_id": ch.document.external_meeting_id,
+            "snippet": snippet or ch.text[:SNIPPET_CHARS],
+            "score": float(f"{score:.4g}") if score is not None else None,
+            "ranks": ranks,
+        })
+    timings["total"] = _ms(started)
+    return results
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -139,3 +140,31 @@ LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL ="/face/verify/"
 LOGOUT_REDIRECT_URL = "/login/"
 
+# Face inference service (manage.py run_face_service)
+FACE_SERVICE_SOCKET = os.environ.get("WARF_FACE_SOCKET", "/tmp/warf-face.sock")
+
+# Queued face verification (manage.py run_face_verifier must be running)
+FACE_VERIFY_QUEUE = os.environ.get("WARF_FACE_QUEUE", "0") == "1"
+FACE_QUEUE_MAX_PENDING = 200
+
+# Reuse a face verification across meetings (same user + session)
+FACE_VERIFY_TTL_MINUTES = 120
+FACE_VERIFY_CACHE_MIN_CONFIDENCE = 0.75
+
+
+# Background AI minutes generation (manage.py run_ai_jobs)
+AI_JOBS_ENABLED = os.environ.get("WARF_AI_JOBS", "1") == "1"
+
+
+# Assistant dense retrieval (manage.py build_knowledge_vectors)
+# "hashing" = offline deterministic encoder (no semantics, dev only)
+KNOWLEDGE_EMBEDDING_MODEL = os.environ.get(
+    "WARF_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+KNOWLEDGE_VECTOR_DIR = BASE_DIR / "vector_index"
+# "hybrid" = BM25 + embeddings fused with reciprocal rank fusion;
+# "dense" / "hybrid" fall back to "lexical" (BM25) while there is no vector index
+ASSISTANT_RETRIEVER = os.environ.get("WARF_RETRIEVER", "hybrid")
+# optional cross-encoder reranking of the fused top candidates ("" = off),
+# e.g. "cross-encoder/ms-marco-MiniLM-L-6-v2"
+ASSISTANT_RERANK_MODEL = os.environ.get("WARF_RERANK_MODEL", "")
@@ -0,0 +1,142 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.services.ai_meeting_engine import backends, config
+from meetings.services.ai_meeting_engine.pipeline import build_output
+
+MODES = ("split", "combined")
+
+
+def build_transcript(data: dict) -> str:
+    """
+    seed_data rows hold structured decisions, not transcripts: rebuild a
+    plausible meeting dialogue from them (same text for every mode).
+    """
+    lines = []
+    summaries = data.get("summaries") or {}
+
+    if data.get("problem"):
+        lines.append(f"Admin: Today's problem: {data['problem']}")
+    for role in ("admin", "supervisor", "employee"):
+        if summaries.get(role):
+            lines.append(f"{role.title()}: {summaries[role]}")
+    for i, option in enumerate(data.get("options") or [], start=1):
+        lines.append(f"Supervisor: Option {i}: {option}")
+    if data.get("decision"):
+        lines.append(f"Admin: We decided to go with this: {data['decision']}")
+    if data.get("justification"):
+        lines.append(f"Admin: {data['justification']}")
+
+    for task in data.get("tasks") or []:
+        if not isinstance(task, dict) or not task.get("task"):
+            continue
+        owner = task.get("owner") or task.get("assigned_role") or "Team"
+        line = f"{owner}: I will {task['task'][0].lower()}{task['task'][1:]}"
+        if task.get("priority"):
+            line += f" Priority is {str(task['priority']).lower()}."
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+class Command(BaseCommand):
+    help = "Compare split (2 calls) vs combined (1 call) AI modes on seed_data meetings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=str(Path(settings.BASE_DIR) / "seed_data" / "all_meetings.jsonl"),
+        )
+        parser.add_argument("--limit", type=int, default=0, help="0 = all meetings")
+        parser.add_argument("--modes", default=",".join(MODES))
+        parser.add_argument(
+            "--backend",
+            default=config.LLM_BACKEND,
+            help='"local" (offline, token estimates) or "openai" (real latency and usage)',
+        )
+
+    def handle(self, *args, **options):
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        unknown = [m for m in modes if m not in MODES]
+        if unknown:
+            raise CommandError(f"Unknown mode(s): {', '.join(unknown)}")
+
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        meetings = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                transcript = build_transcript(row.get("decision_data") or {})
+                if transcript:
+                    meetings.append((row.get("meeting_id") or f"seed-{line_num}", transcript))
+
+        if options["limit"]:
+            meetings = meetings[:options["limit"]]
+
+        backends.set_backend(options["backend"])
+        self.stdout.write(
+            f"Meetings: {len(meetings)} | backend: {options['backend']} | model: {config.MODEL_NAME}"
+        )
+
+        report = {}
+        for mode in modes:
+            latencies = []
+            failed = 0
+            before = backends.usage_snapshot()
+
+            for meeting_id, transcript in meetings:
+                start = time.perf_counter()
+                output = build_output(meeting_id, transcript, mode=mode)
+                latencies.append(time.perf_counter() - start)
+                if output.get("errors"):
+                    failed += 1
+
+            after = backends.usage_snapshot()
+            usage = {k: after[k] - before[k] for k in after}
+            report[mode] = {
+                "failed": failed,
+                "mean_s": statistics.mean(latencies) if latencies else 0.0,
+                "p50_s": _percentile(latencies, 50),
+                "p95_s": _percentile(latencies, 95),
+                **usage,
+            }
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'mode':<10}{'failed':>8}{'mean s':>9}{'p50 s':>9}{'p95 s':>9}"
+            f"{'calls':>8}{'input tok':>12}{'output tok':>12}"
+        )
+        for mode, r in report.items():
+            self.stdout.write(
+                f"{mode:<10}{r['failed']:>8}{r['mean_s']:>9.3f}{r['p50_s']:>9.3f}{r['p95_s']:>9.3f}"
+                f"{r['calls']:>8}{r['prompt_tokens']:>12}{r['completion_tokens']:>12}"
+            )
+
+        if "split" in report and "combined" in report and report["split"]["prompt_tokens"]:
+            split, combined = report["split"], report["combined"]
+            ratio = combined["prompt_tokens"] / split["prompt_tokens"]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Combined mode uses {ratio:.0%} of the split-mode input tokens "
+                    f"({combined['calls']} vs {split['calls']} calls)."
+                )
+            )
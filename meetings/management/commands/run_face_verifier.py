@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from meetings.services import face_queue
+
+
+class Command(BaseCommand):
+    help = "Process queued face verification frames (see verify_face_api)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Concurrent verifications")
+        parser.add_argument("--poll-interval", type=float, default=0.5)
+
+    def handle(self, *args, **options):
+        try:
+            face_queue.run_workers(
+                workers=options["workers"],
+                poll_interval=options["poll_interval"],
+                log=self.stdout.write,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Face verifier stopped"))
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-17 19:00
+
+from django.db import migrations, models
+
+
+def drop_duplicate_pending(apps, schema_editor):
+    # concurrent enqueues could leave several pending jobs per (meeting, user): keep the newest
+    FaceVerificationJob = apps.get_model("meetings", "FaceVerificationJob")
+
+    seen = set()
+    stale = []
+    pending = FaceVerificationJob.objects.filter(status="pending").order_by("-created_at", "-id")
+    for job_id, meeting_id, user_id in pending.values_list("id", "meeting_id", "user_id"):
+        if (meeting_id, user_id) in seen:
+            stale.append(job_id)
+        else:
+            seen.add((meeting_id, user_id))
+
+    FaceVerificationJob.objects.filter(id__in=stale).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0008_faceverificationjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='faceverificationjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('meeting', 'user'), name='meetings_face_job_one_pending'),
+        ),
+    ]
@@ -139,3 +139,66 @@ class Attendee(models.Model):
 
     def __str__(self):
         return f"{self.user} ({self.role}) @ {self.meeting}"
+
+
+class FaceVerificationJob(models.Model):
+    """
+    Queued camera frame waiting for face verification.
+    - One pending job per (meeting, user): a newer frame replaces the old one.
+    - Processed by `manage.py run_face_verifier`; the browser polls the ticket (id).
+    """
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="face_jobs",
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="face_jobs",
+    )
+
+    image = models.BinaryField(blank=True, default=b"")  # encoded frame (JPEG)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+
+    approved = models.BooleanField(default=False)
+    confidence = models.FloatField(null=True, blank=True)
+    message = models.CharField(max_length=255, blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["meeting", "user"],
+                condition=models.Q(status="pending"),
+                name="meetings_face_job_one_pending",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Face job #{self.pk} — {self.user} @ {self.meeting} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
@@ -0,0 +1,355 @@
+"""
+LLM backends for the AI meeting engine (config.LLM_BACKEND).
+
+- "openai": one shared OpenAI client per process, created on first use,
+  with a pooled keep-alive HTTP client.
+- "local" : deterministic offline stand-in (no network, no API key) for
+  tests, benchmarks and load tests of the minutes flow.
+
+Both expose:
+    complete(messages, temperature, max_tokens, timeout=None, response_format=None, stage="", meeting_id=None) -> str
+    stream(messages, temperature, max_tokens, timeout=None, stage="", meeting_id=None) -> iterator of text deltas
+
+Every call holds a slot of a process-wide semaphore
+(config.LLM_MAX_CONCURRENCY), so pipeline fan-out cannot exceed the pool,
+waits for the per-minute request/token budgets (LLM_REQUESTS_PER_MINUTE,
+LLM_TOKENS_PER_MINUTE; 0 = unlimited) and adds its token usage to
+process-wide counters (usage_snapshot()). Each call is also recorded
+(stage, tokens, latency, retries) through metrics.py.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from . import config, metrics
+from .chunking import estimate_tokens
+
+_backend = None
+_backend_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(config.LLM_MAX_CONCURRENCY)
+
+
+_usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+_usage_lock = threading.Lock()
+
+
+def _record_usage(prompt_tokens: int, completion_tokens: int, stage: str = "", meeting_id=None, **fields):
+    with _usage_lock:
+        _usage["calls"] += 1
+        _usage["prompt_tokens"] += int(prompt_tokens or 0)
+        _usage["completion_tokens"] += int(completion_tokens or 0)
+
+    metrics.record(
+        stage or "llm",
+        meeting_id,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        **fields,
+    )
+
+
+def _record_failure(stage: str, meeting_id, started: float, error: Exception):
+    metrics.record(
+        stage or "llm",
+        meeting_id,
+        latency=time.perf_counter() - started,
+        ok=False,
+        error=str(error) or error.__class__.__name__,
+    )
+
+
+def usage_snapshot() -> dict:
+    """
+    Totals since process start; diff two snapshots to measure a run.
+    """
+    with _usage_lock:
+        return dict(_usage)
+
+
+def _estimate_prompt(messages) -> int:
+    return sum(estimate_tokens(m.get("content", "")) for m in messages)
+
+
+class RateLimiter:
+    """
+    Sliding 60s window over requests and tokens (provider RPM/TPM limits).
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self):
+        self._events = deque()  # (timestamp, tokens)
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        rpm = config.LLM_REQUESTS_PER_MINUTE
+        tpm = config.LLM_TOKENS_PER_MINUTE
+        if not rpm and not tpm:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._events and self._events[0][0] <= now - self.WINDOW:
+                    self._tokens -= self._events.popleft()[1]
+
+                fits_requests = not rpm or len(self._events) < rpm
+                # a single call larger than the budget still goes (alone)
+                fits_tokens = not tpm or not self._events or self._tokens + tokens <= tpm
+                if fits_requests and fits_tokens:
+                    self._events.append((now, tokens))
+                    self._tokens += tokens
+                    return
+
+                wait = self._events[0][0] + self.WINDOW - now
+            time.sleep(max(wait, 0.05))
+
+
+_limiter = RateLimiter()
+
+
+@contextmanager
+def _slot(messages, max_tokens):
+    # providers count max_tokens against the token budget
+    _limiter.acquire(_estimate_prompt(messages) + max_tokens)
+    _slots.acquire()
+    try:
+        yield
+    finally:
+        _slots.release()
+
+
+class OpenAIBackend:
+    name = "openai"
+
+    def __init__(self):
+        import httpx
+        from openai import DefaultHttpxClient, OpenAI
+
+        self.client = OpenAI(
+            max_retries=config.LLM_MAX_RETRIES,
+            timeout=config.STAGE_TIMEOUT_SECONDS,
+            http_client=DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=config.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.LLM_MAX_KEEPALIVE,
+                    keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(
+                    config.STAGE_TIMEOUT_SECONDS,
+                    connect=config.LLM_CONNECT_TIMEOUT,
+                ),
+            ),
+        )
+
+    def _create(self, messages, temperature, max_tokens, timeout, **extra):
+        # raw response: exposes retries_taken next to the parsed completion
+        return self.client.chat.completions.with_raw_response.create(
+            model=config.MODEL_NAME,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout or config.STAGE_TIMEOUT_SECONDS,
+            **extra,
+        )
+
+    def complete(self, messages, temperature, max_tokens, timeout=None, response_format=None,
+                 stage="", meeting_id=None):
+        extra = {"response_format": response_format} if response_format else {}
+        with _slot(messages, max_tokens):
+            started = time.perf_counter()
+            try:
+                raw = self._create(messages, temperature, max_tokens, timeout, **extra)
+                response = raw.parse()
+            except Exception as e:
+                _record_failure(stage, meeting_id, started, e)
+                raise
+            latency = time.perf_counter() - started
+
+        content = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            prompt_tokens, completion_tokens = _estimate_prompt(messages), estimate_tokens(content)
+
+        _record_usage(
+            prompt_tokens,
+            completion_tokens,
+            stage=stage,
+            meeting_id=meeting_id,
+            latency=latency,
+            retries=getattr(raw, "retries_taken", 0),
+        )
+        return content
+
+    def stream(self, messages, temperature, max_tokens, timeout=None, stage="", meeting_id=None):
+        parts = []
+        with _slot(messages, max_tokens):
+            started = time.perf_counter()
+            try:
+                raw = self._create(messages, temperature, max_tokens, timeout, stream=True)
+                for chunk in raw.parse():
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            except Exception as e:
+                _record_failure(stage, meeting_id, started, e)
+                raise
+            latency = time.perf_counter() - started
+
+        # streamed responses carry no usage block: estimate
+        _record_usage(
+            _estimate_prompt(messages),
+            estimate_tokens("".join(parts)),
+            stage=stage,
+            meeting_id=meeting_id,
+            latency=latency,
+            retries=getattr(raw, "retries_taken", 0),
+        )
+
+
+# -------------------------
+# Local (offline) backend
+# -------------------------
+SPEAKER_RE = re.compile(r"^\s*\[?([^\]:]{1,40})[\]:]\s*(.*)$")
+DECISION_RE = re.compile(r"\b(decided|decision|agreed|approved|we will go with)\b", re.I)
+ACTION_RE = re.compile(r"\b(will|needs? to|must|should|action|follow up|todo)\b", re.I)
+RISK_RE = re.compile(r"\b(risk|concern|blocker|blocked|delay|issue)\b", re.I)
+HIGH_RE = re.compile(r"\b(urgent|asap|critical|immediately|high priority|priority is high)\b", re.I)
+DUE_RE = re.compile(
+    r"\bby\s+(\d{4}-\d{2}-\d{2}|today|tomorrow|next week|end of (?:the )?(?:day|week|month)"
+    r"|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.I,
+)
+
+
+def _short(text: str, words: int = 20) -> str:
+    parts = text.split()
+    return " ".join(parts[:words]) + (" …" if len(parts) > words else "")
+
+
+def _lines(messages):
+    text = messages[-1]["content"] if messages else ""
+    if "Transcript:" in text:
+        # extractor prompt: rules first, transcript last
+        text = text.split("Transcript:", 1)[1]
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.endswith(":"):
+            yield line
+
+
+class LocalBackend:
+    """
+    Rule-based "model": summary = first lines of the transcript as bullets,
+    decisions = keyword matches. Same input -> same output.
+    """
+
+    name = "local"
+
+    def _summary(self, messages, max_tokens):
+        bullets = []
+        budget = max_tokens * 4  # ~4 characters per token
+        for line in _lines(messages):
+            bullet = f"- {_short(line)}"
+            if len(bullets) >= 7 or budget - len(bullet) < 0:
+                break
+            budget -= len(bullet)
+            bullets.append(bullet)
+        return "\n".join(bullets)
+
+    def _extract(self, messages):
+        data = {"decisions": [], "action_items": [], "risks": [], "notes": []}
+
+        for line in _lines(messages):
+            speaker, text = None, line
+            match = SPEAKER_RE.match(line)
+            if match:
+                speaker, text = match.group(1).strip(), match.group(2).strip()
+
+            if DECISION_RE.search(text):
+                data["decisions"].append(_short(text))
+            elif RISK_RE.search(text):
+                data["risks"].append(_short(text))
+            elif ACTION_RE.search(text):
+                due = DUE_RE.search(text)
+                data["action_items"].append({
+                    "title": _short(text, 12),
+                    "assignee": speaker,
+                    "due_date": due.group(1) if due else None,
+                    "priority": "high" if HIGH_RE.search(text) else "medium",
+                })
+
+        return data
+
+    def complete(self, messages, temperature, max_tokens, timeout=None, response_format=None,
+                 stage="", meeting_id=None):
+        with _slot(messages, max_tokens):
+            started = time.perf_counter()
+            if config.LOCAL_BACKEND_LATENCY:
+                time.sleep(config.LOCAL_BACKEND_LATENCY)
+
+            if response_format:
+                data = self._extract(messages)
+                schema = (response_format.get("json_schema") or {}).get("schema") or {}
+                if "summary" in schema.get("properties", {}):
+                    data = {"summary": self._summary(messages, max_tokens), **data}
+                content = json.dumps(data, ensure_ascii=False)
+            else:
+                content = self._summary(messages, max_tokens)
+            latency = time.perf_counter() - started
+
+        _record_usage(
+            _estimate_prompt(messages),
+            estimate_tokens(content),
+            stage=stage,
+            meeting_id=meeting_id,
+            latency=latency,
+        )
+        return content
+
+    def stream(self, messages, temperature, max_tokens, timeout=None, stage="", meeting_id=None):
+        text = self.complete(messages, temperature, max_tokens, timeout, stage=stage, meeting_id=meeting_id)
+        for word in re.findall(r"\S+\s*", text):
+            yield word
+
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "local": LocalBackend,
+}
+
+
+def get_backend():
+    """
+    Process-wide backend (created on first use, shared by all threads).
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                try:
+                    backend_cls = BACKENDS[config.LLM_BACKEND]
+                except KeyError:
+                    raise ValueError(f"Unknown LLM backend: {config.LLM_BACKEND!r}")
+                _backend = backend_cls()
+    return _backend
+
+
+def set_backend(name: str):
+    """
+    Switch backend at runtime (tests, benchmarks).
+    """
+    global _backend
+    with _backend_lock:
+        config.LLM_BACKEND = name
+        _backend = None
@@ -0,0 +1,32 @@
+import hashlib
+import json
+
+from . import config
+
+
+def cache_key(transcript: str) -> str:
+    """
+    Content address of a pipeline run: same transcript + same model
+    settings + same prompt version => same output.
+    """
+    payload = {
+        "transcript": (transcript or "").strip(),
+        "model": config.MODEL_NAME,
+        "prompt_version": config.PROMPT_VERSION,
+        "mode": config.PIPELINE_MODE,
+        "temperature": [config.TEMPERATURE_SUMMARY, config.TEMPERATURE_DECISIONS],
+        "max_tokens": [
+            config.MAX_TOKENS_SUMMARY,
+            config.MAX_TOKENS_DECISIONS,
+            config.MAX_TOKENS_CHUNK_SUMMARY,
+            config.MAX_TOKENS_SUMMARY_MERGED,
+            config.MAX_TOKENS_COMBINED,
+        ],
+        "chunk_max_tokens": config.CHUNK_MAX_TOKENS,
+        "compress": config.COMPRESS_TRANSCRIPT,
+    }
+    if config.LLM_BACKEND != "openai":
+        # offline backend output must never be served as a real model result
+        payload["backend"] = config.LLM_BACKEND
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
@@ -0,0 +1,109 @@
+import re
+
+from . import config
+
+# "Ahmed: ..." / "Speaker 2: ..." / "[Sara] ..." at the start of a line
+SPEAKER_RE = re.compile(r"^\s*(\[[^\]]{1,40}\]|[^\W\d][\w .'\-]{0,39}:)\s", re.UNICODE)
+SENTENCE_RE = re.compile(r"(?<=[.!?؟])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token) — good enough for budgeting.
+    """
+    return len(text or "") // 4 + 1
+
+
+def _turns(transcript: str):
+    """
+    Group lines into speaker turns (a new turn starts at a speaker label).
+    """
+    turns = []
+    current = []
+    for line in transcript.splitlines():
+        if SPEAKER_RE.match(line) and current:
+            turns.append("\n".join(current))
+            current = []
+        if line.strip():
+            current.append(line)
+    if current:
+        turns.append("\n".join(current))
+    return turns
+
+
+def _split_words(text: str, max_tokens: int):
+    """
+    Pack words into pieces of at most max_tokens (same estimate as
+    estimate_tokens); a word longer than that is cut by characters.
+    """
+    max_chars = max(1, max_tokens * 4 - 1)  # estimate_tokens(max_chars chars) == max_tokens
+    pieces = []
+    current = []
+    length = 0
+    for word in text.split():
+        while len(word) > max_chars:
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        added = len(word) + (1 if current else 0)
+        if current and length + added > max_chars:
+            pieces.append(" ".join(current))
+            current = []
+            length = 0
+            added = len(word)
+        current.append(word)
+        length += added
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _split_long(text: str, max_tokens: int):
+    """
+    A single turn bigger than the budget: split by sentences, then words.
+    """
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_RE.split(text):
+        if estimate_tokens(sentence) > max_tokens:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.extend(_split_words(sentence, max_tokens))
+            continue
+        candidate = f"{current} {sentence}".strip()
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_transcript(transcript: str, max_tokens: int = None):
+    """
+    Split a transcript into chunks of at most ~max_tokens, cutting only
+    between speaker turns when possible.
+    """
+    max_tokens = max_tokens or config.CHUNK_MAX_TOKENS
+    transcript = (transcript or "").strip()
+    if estimate_tokens(transcript) <= max_tokens:
+        return [transcript] if transcript else []
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for turn in _turns(transcript):
+        parts = [turn] if estimate_tokens(turn) <= max_tokens else _split_long(turn, max_tokens)
+        for part in parts:
+            tokens = estimate_tokens(part)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(part)
+            current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
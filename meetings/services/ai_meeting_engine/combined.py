@@ -0,0 +1,73 @@
+"""
+Combined mode (config.PIPELINE_MODE = "combined"): one structured request
+returns the summary and the decisions, so the transcript is sent (and
+billed as input) once instead of twice.
+"""
+
+import json
+from datetime import datetime
+
+from . import config
+from .backends import get_backend
+from .decision_extractor import EXTRACTION_RULES
+from .schemas import MINUTES_RESPONSE_FORMAT, DecisionOutput
+from .summarizer import CHUNK_PROMPT, SYSTEM_PROMPT
+
+COMBINED_PROMPT = (
+    "You are an AI meeting assistant.\n"
+    "Return the meeting summary in `summary` and the structured decisions, "
+    "action items, risks and notes in the other fields.\n\n"
+    "Summary rules:\n" + SYSTEM_PROMPT + "\n\n"
+    "Extraction rules:" + EXTRACTION_RULES
+)
+
+COMBINED_CHUNK_PROMPT = (
+    "You are an AI meeting assistant.\n"
+    "Return `summary` and the structured fields for this part of the meeting only.\n\n"
+    "Summary rules:\n" + CHUNK_PROMPT + "\n\n"
+    "Extraction rules:" + EXTRACTION_RULES
+)
+
+
+def analyze_meeting(meeting_id: str, transcript: str, part: tuple = None) -> dict:
+    """
+    One call -> {"meeting_id", "summary", "output" (validated decisions), "created_at"}.
+    part: (index, total) when analysing one chunk of a long transcript.
+    """
+    if part:
+        system = COMBINED_CHUNK_PROMPT
+        header = f"Meeting ID: {meeting_id} (part {part[0]} of {part[1]})"
+        max_tokens = config.MAX_TOKENS_CHUNK_SUMMARY + config.MAX_TOKENS_DECISIONS
+    else:
+        system = COMBINED_PROMPT
+        header = f"Meeting ID: {meeting_id}"
+        max_tokens = config.MAX_TOKENS_COMBINED
+
+    content = get_backend().complete(
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": f"{header}\n\nTranscript:\n{transcript}"},
+        ],
+        temperature=config.TEMPERATURE_DECISIONS,
+        max_tokens=max_tokens,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="combined_chunk" if part else "combined",
+        meeting_id=meeting_id,
+        response_format=MINUTES_RESPONSE_FORMAT,
+    )
+
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Malformed minutes JSON: {e}") from e
+
+    summary = data.get("summary") if isinstance(data, dict) else None
+    if not isinstance(summary, str):
+        raise ValueError("Minutes JSON has no summary.")
+
+    return {
+        "meeting_id": meeting_id,
+        "summary": summary.strip(),
+        "output": DecisionOutput.from_dict(data).to_dict(),
+        "created_at": datetime.utcnow().isoformat(),
+    }
@@ -0,0 +1,170 @@
+"""
+Deterministic transcript pre-compression (runs before any LLM call).
+
+- normalises whitespace and VTT/SRT artefacts (headers, cue numbers, tags)
+- strips timestamps ("[00:12:03]", "00:12:03 Sara:", "Sara (0:42):", "a --> b")
+- collapses speaker labels: consecutive lines of one speaker become one turn
+- drops fillers (um, uh, اممم, ...), boilerplate ([inaudible], "recording started")
+  and duplicate / rolling-caption lines
+
+Content words are never rewritten, so summaries keep the same facts.
+Manual minutes without speaker labels keep their line structure.
+"""
+
+import re
+
+from .chunking import estimate_tokens
+
+TIME = r"\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?"
+
+CUE_TIMING_RE = re.compile(rf"^\s*{TIME}\s*-->\s*{TIME}.*$")
+HEADER_RE = re.compile(r"^\s*(WEBVTT|NOTE\b|STYLE\b|REGION\b|Kind:|Language:)")   # case-sensitive: "Note:" in minutes stays
+CUE_NUMBER_RE = re.compile(r"^\s*\d+\s*$")
+BRACKET_TIME_RE = re.compile(rf"[\[(<]\s*{TIME}\s*[\])>]")
+LEADING_TIME_RE = re.compile(rf"^\s*{TIME}\s*[-–|]?\s*")
+VOICE_TAG_RE = re.compile(r"<v(?:\.[\w.]+)?\s+([^>]+)>")
+TAG_RE = re.compile(r"</?[a-z][^>]*>", re.I)
+
+# "Sara:" / "[Sara]" / "Sara 0:42" / "SPEAKER 2 -" at the start of a line
+LABEL_RE = re.compile(r"^\s*(?:\[([^\]]{1,40})\]|([^\W\d][\w .'\-]{0,39}?))\s*(?::|\s-\s)\s*(.*)$", re.UNICODE)
+LABEL_LINE_RE = re.compile(rf"^\s*([^\W\d][\w .'\-]{{0,39}}?)\s+{TIME}\s*$", re.UNICODE)
+
+NOISE = r"inaudible|crosstalk|silence|laughter|laughs|music|background noise|applause|noise|pause"
+NOISE_TAG_RE = re.compile(rf"[\[(]\s*(?:{NOISE})[^\])]*[\])]", re.I)
+BOILERPLATE_RE = re.compile(
+    r"^\W*(?:recording (?:started|stopped|in progress)"
+    r"|this (?:meeting|call) is being recorded"
+    r"|transcription (?:started|stopped)"
+    r"|.* (?:joined|left) the meeting)\W*$",
+    re.I,
+)
+FILLER_RE = re.compile(r",?\s*\b(?:u+m+|u+h+|e+r+m+|h+m+|m+h?m+|uh-huh|mm-hmm|a+h+|ام{2,}|ا{3,}|آ{2,})\b[,.]?\s*", re.I)
+HEDGE_RE = re.compile(r",?\s*\b(?:you know|i mean|sort of|kind of),\s*", re.I)
+SPACES_RE = re.compile(r"[ \t ​]+")
+WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+MIN_DUPLICATE_CHARS = 12   # short lines ("Yes.", "Agreed.") are never dropped as duplicates
+
+
+def _clean(line: str) -> str:
+    line = VOICE_TAG_RE.sub(lambda m: f"{m.group(1).strip()}: ", line)
+    line = TAG_RE.sub("", line)
+    line = BRACKET_TIME_RE.sub(" ", line)
+    line = NOISE_TAG_RE.sub(" ", line)
+    line = HEDGE_RE.sub(" ", line)
+    line = FILLER_RE.sub(" ", line)
+    line = SPACES_RE.sub(" ", line).strip()
+    return re.sub(r"\s+([,.:;?!])", r"\1", line).strip(",; ")
+
+
+def _split_label(line: str):
+    """
+    (speaker, text) for a labelled line, else (None, line).
+    """
+    match = LABEL_RE.match(line)
+    if not match:
+        return None, line
+    speaker = (match.group(1) or match.group(2) or "").strip()
+    # "Note: ..." / "Agenda - ..." inside manual minutes are fine either way
+    if not speaker or len(speaker.split()) > 4:
+        return None, line
+    return speaker, match.group(3).strip()
+
+
+def _join(pieces) -> str:
+    # merged lines keep a sentence boundary between them
+    parts = [p if p[-1] in ".?!:;…؟" else f"{p}." for p in pieces[:-1]]
+    return " ".join(parts + pieces[-1:])
+
+
+def _key(text: str) -> str:
+    return WORD_RE.sub(" ", text.lower()).strip()
+
+
+def compress_transcript(transcript: str):
+    """
+    Returns (compressed_text, stats).
+    stats: chars/tokens before and after, ratio (tokens kept) and lines dropped.
+    """
+    transcript = transcript or ""
+    turns = []           # [speaker or None, [pieces]]
+    seen = set()
+    dropped = 0
+    pending_speaker = None
+
+    lines = transcript.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    for raw in lines:
+        if not raw.strip():
+            continue
+        if CUE_TIMING_RE.match(raw) or HEADER_RE.match(raw) or CUE_NUMBER_RE.match(raw):
+            dropped += 1
+            continue
+
+        # "Sara Ali   0:42" on its own line (Teams/Zoom export)
+        label_line = LABEL_LINE_RE.match(raw)
+        if label_line:
+            pending_speaker = label_line.group(1).strip()
+            continue
+
+        line = _clean(raw)
+        # "00:12:03 Sara: ..." -> "Sara: ..." ("10:30 - Opening" in minutes stays)
+        untimed = LEADING_TIME_RE.sub("", line, count=1)
+        if untimed != line and _split_label(untimed)[0]:
+            line = untimed
+        if not line or BOILERPLATE_RE.match(line):
+            dropped += 1
+            continue
+
+        speaker, text = _split_label(line)
+        if speaker and not text:
+            pending_speaker = speaker
+            continue
+        if speaker is None and pending_speaker:
+            speaker = pending_speaker
+        elif speaker:
+            pending_speaker = None
+
+        if not text or not _key(text):
+            dropped += 1
+            continue
+
+        key = _key(text)
+        if len(key) >= MIN_DUPLICATE_CHARS and key in seen:
+            dropped += 1
+            continue
+
+        last = turns[-1] if turns else None
+        if last is not None and speaker is not None and last[0] == speaker:
+            previous = last[1][-1]
+            previous_key = _key(previous)
+            if key.startswith(previous_key):
+                # rolling captions: the new line extends the previous one
+                last[1][-1] = text
+                seen.discard(previous_key)
+                dropped += 1
+            elif previous_key.startswith(key):
+                dropped += 1
+                continue
+            else:
+                last[1].append(text)
+        else:
+            turns.append([speaker, [text]])
+        seen.add(key)
+
+    out_lines = []
+    for speaker, pieces in turns:
+        text = _join(pieces)
+        out_lines.append(f"{speaker}: {text}" if speaker else text)
+    compressed = "\n".join(out_lines)
+
+    tokens_in = estimate_tokens(transcript)
+    tokens_out = estimate_tokens(compressed)
+    stats = {
+        "chars_in": len(transcript),
+        "chars_out": len(compressed),
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "ratio": round(tokens_out / tokens_in, 3) if tokens_in else 1.0,
+        "lines_dropped": dropped,
+    }
+    return compressed, stats
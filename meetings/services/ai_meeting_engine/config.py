@@ -1,5 +1,41 @@
+import os
+
 MODEL_NAME = "gpt-4o-mini"
+PROMPT_VERSION = "v3"             # bump when prompts change (invalidates cached outputs)
 TEMPERATURE_SUMMARY = 0.3
 TEMPERATURE_DECISIONS = 0.2
 MAX_TOKENS_SUMMARY = 600
 MAX_TOKENS_DECISIONS = 700
+
+# "split": summary and decisions as two concurrent calls
+# "combined": one structured call returns both (transcript sent once)
+PIPELINE_MODE = os.environ.get("WARF_AI_MODE", "split")
+MAX_TOKENS_COMBINED = 1300        # summary + decisions in one response
+
+# Pipeline concurrency
+PIPELINE_MAX_WORKERS = 16         # stages (LLM calls) running at the same time
+STAGE_TIMEOUT_SECONDS = 60        # per stage; the pipeline returns partial results after this
+
+# Long transcripts: map-reduce over chunks
+CHUNK_MAX_TOKENS = 6000           # transcripts above this are split by speaker turns
+MAX_TOKENS_CHUNK_SUMMARY = 350    # partial summary per chunk
+MAX_TOKENS_SUMMARY_MERGED = 900   # final summary merged from the partials
+
+# Pre-compression (compress.py): timestamps, fillers, repeated speaker tags
+COMPRESS_TRANSCRIPT = os.environ.get("WARF_AI_COMPRESS", "1") == "1"
+
+# LLM backend (see backends.py): "openai" or "local" (offline, deterministic)
+LLM_BACKEND = os.environ.get("WARF_LLM_BACKEND", "openai")
+LLM_MAX_CONCURRENCY = 16          # in-flight LLM calls per process
+LLM_MAX_CONNECTIONS = 16          # HTTP pool size (keep >= LLM_MAX_CONCURRENCY)
+LLM_MAX_KEEPALIVE = 8             # idle connections kept open
+LLM_KEEPALIVE_EXPIRY = 30         # seconds
+LLM_CONNECT_TIMEOUT = 5           # seconds
+LLM_MAX_RETRIES = 2               # SDK retries (429 / 5xx / connection errors)
+LLM_REQUESTS_PER_MINUTE = int(os.environ.get("WARF_LLM_RPM", "0"))   # 0 = unlimited
+LLM_TOKENS_PER_MINUTE = int(os.environ.get("WARF_LLM_TPM", "0"))     # prompt + max_tokens; 0 = unlimited
+LOCAL_BACKEND_LATENCY = float(os.environ.get("WARF_LOCAL_LLM_LATENCY", "0"))  # simulated seconds per call
+
+# Instrumentation (metrics.py -> minutes.AICallLog)
+METRICS_ENABLED = os.environ.get("WARF_AI_METRICS", "1") == "1"
+METRICS_BUFFER_SIZE = 10000       # records kept in memory until flushed
@@ -1,28 +1,37 @@
 import json
-from openai import OpenAI
 from . import config
+from .backends import get_backend
+from .schemas import DECISIONS_RESPONSE_FORMAT, DecisionOutput
 
-client = OpenAI()
-
-JSON_SCHEMA_HINT = """
-Return ONLY valid JSON (no markdown, no code fences).
-Schema:
-{
-  "decisions": [string],
-  "action_items": [
-    { "title": string, "assignee": string|null, "due_date": string|null, "priority": "low"|"medium"|"high" }
-  ],
-  "risks": [string],
-  "notes": [string]
-}
+# The output shape is enforced by DECISIONS_RESPONSE_FORMAT (structured
+# outputs); the prompt only carries the content rules.
+EXTRACTION_RULES = """
+Extract the decisions, action items, risks and notes of the meeting.
 Rules:
 - If assignee not mentioned, use null.
 - If due date not mentioned, use null.
 - Keep items short and actionable.
 """
 
+def empty_output() -> dict:
+    return DecisionOutput().to_dict()
+
+
+def parse_output(content: str) -> dict:
+    """
+    Model JSON -> validated dict (parsed once, never re-parsed downstream).
+    Raises ValueError on malformed output (e.g. truncated at max_tokens).
+    """
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Malformed decisions JSON: {e}") from e
+
+    return DecisionOutput.from_dict(data).to_dict()
+
+
 def extract_decisions(meeting_id: str, transcript: str) -> dict:
-    prompt = f"""{JSON_SCHEMA_HINT}
+    prompt = f"""{EXTRACTION_RULES}
 
 Meeting ID: {meeting_id}
 
@@ -30,30 +39,78 @@ Transcript:
 {transcript}
 """
 
-    resp = client.chat.completions.create(
-        model=config.MODEL_NAME,
+    content = get_backend().complete(
         messages=[
             {"role": "system", "content": "You extract structured decisions and action items from meeting transcripts."},
             {"role": "user", "content": prompt},
         ],
         temperature=config.TEMPERATURE_DECISIONS,
         max_tokens=config.MAX_TOKENS_DECISIONS,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="decisions",
+        meeting_id=meeting_id,
+        response_format=DECISIONS_RESPONSE_FORMAT,
     )
 
-    content = resp.choices[0].message.content.strip()
+    return {"meeting_id": meeting_id, "output": parse_output(content)}
 
-    # Defensive JSON parsing
-    try:
-        data = json.loads(content)
-    except json.JSONDecodeError:
-        # fallback: wrap raw text
-        data = {
-            "decisions": [],
-            "action_items": [],
-            "risks": [],
-            "notes": [],
-            "_raw": content
-        }
-
-    return {"meeting_id": meeting_id, "output": data}
 
+# -------------------------
+# Merge (map-reduce over transcript chunks)
+# -------------------------
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def _norm(text) -> str:
+    return " ".join(str(text or "").lower().split()).strip(" .")
+
+
+def _dedupe(items):
+    seen = set()
+    out = []
+    for item in items:
+        if not isinstance(item, str):
+            continue
+        key = _norm(item)
+        if key and key not in seen:
+            seen.add(key)
+            out.append(item.strip())
+    return out
+
+
+def merge_outputs(outputs: list) -> dict:
+    """
+    Merge per-chunk extractor outputs:
+    - decisions / risks / notes: de-duplicated (case/space-insensitive)
+    - action items: merged by (title, assignee); keeps the first known
+      due date and the highest priority
+    """
+    merged = empty_output()
+    action_items = {}
+
+    for data in outputs:
+        if not isinstance(data, dict):
+            continue
+
+        for field in ("decisions", "risks", "notes"):
+            merged[field].extend(data.get(field) or [])
+
+        for item in data.get("action_items") or []:
+            if not isinstance(item, dict) or not _norm(item.get("title")):
+                continue
+
+            key = (_norm(item.get("title")), _norm(item.get("assignee")))
+            existing = action_items.get(key)
+            if existing is None:
+                action_items[key] = dict(item)
+                continue
+
+            if not existing.get("due_date") and item.get("due_date"):
+                existing["due_date"] = item["due_date"]
+            if PRIORITY_RANK.get(item.get("priority"), 1) > PRIORITY_RANK.get(existing.get("priority"), 1):
+                existing["priority"] = item["priority"]
+
+    for field in ("decisions", "risks", "notes"):
+        merged[field] = _dedupe(merged[field])
+    merged["action_items"] = list(action_items.values())
+    return merged
@@ -0,0 +1,97 @@
+"""
+Per-call instrumentation (tokens, latency, retries, cache hits).
+
+record() only appends to an in-memory buffer, so it is safe from the
+pipeline's worker threads; flush() writes the buffer as AICallLog rows
+and is called by service.py at the end of each run (request / job thread).
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from . import config
+
+_buffer = deque(maxlen=config.METRICS_BUFFER_SIZE)
+_lock = threading.Lock()
+
+
+def record(stage: str, meeting_id=None, **fields):
+    if not config.METRICS_ENABLED:
+        return
+
+    row = {
+        "stage": stage,
+        "meeting_id": meeting_id,
+        "backend": config.LLM_BACKEND,
+        "model_name": config.MODEL_NAME,
+        "created_at": datetime.now(timezone.utc),
+        **fields,
+    }
+    with _lock:
+        _buffer.append(row)
+
+
+@contextmanager
+def timed(stage: str, meeting_id=None, **fields):
+    """
+    Record the wall time of a block (e.g. a whole pipeline run).
+    The block may set info["ok"] / info["error"].
+    """
+    info = {"ok": True, "error": ""}
+    start = time.perf_counter()
+    try:
+        yield info
+    except Exception as e:
+        info["ok"] = False
+        info["error"] = str(e) or e.__class__.__name__
+        raise
+    finally:
+        record(stage, meeting_id, latency=time.perf_counter() - start, **info, **fields)
+
+
+def flush() -> int:
+    """
+    Write buffered records to the DB. Returns the number of rows written.
+    """
+    with _lock:
+        rows = list(_buffer)
+        _buffer.clear()
+    if not rows:
+        return 0
+
+    from meetings.models import Meeting
+    from minutes.models import AICallLog
+
+    ids = {int(r["meeting_id"]) for r in rows if str(r["meeting_id"] or "").isdigit()}
+    try:
+        existing = set(Meeting.objects.filter(id__in=ids).values_list("id", flat=True))
+    except Exception:
+        return 0
+
+    logs = []
+    for r in rows:
+        meeting_id = int(r["meeting_id"]) if str(r["meeting_id"] or "").isdigit() else None
+        logs.append(AICallLog(
+            meeting_id=meeting_id if meeting_id in existing else None,
+            stage=r["stage"][:30],
+            backend=r["backend"],
+            model_name=r["model_name"],
+            prompt_tokens=int(r.get("prompt_tokens") or 0),
+            completion_tokens=int(r.get("completion_tokens") or 0),
+            latency_ms=int(round((r.get("latency") or 0.0) * 1000)),
+            retries=int(r.get("retries") or 0),
+            cached=bool(r.get("cached")),
+            ok=bool(r.get("ok", True)),
+            error=(r.get("error") or "")[:255],
+            created_at=r["created_at"],
+        ))
+
+    try:
+        AICallLog.objects.bulk_create(logs)
+    except Exception:
+        # metrics must never fail a generation
+        return 0
+    return len(logs)
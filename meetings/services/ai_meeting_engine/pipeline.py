@@ -1,24 +1,230 @@
-import json
-import os
-from .summarizer import summarize_meeting
-from .decision_extractor import extract_decisions
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
 
-OUTPUT_DIR = "outputs"
+from . import config, metrics
+from .chunking import split_transcript
+from .compress import compress_transcript
+from .summarizer import (
+    summarize_meeting,
+    summarize_chunk,
+    merge_summaries,
+    stream_summary,
+    stream_merged_summary,
+)
+from .decision_extractor import extract_decisions, empty_output, merge_outputs
+from .combined import analyze_meeting
 
-def run_pipeline(meeting_id: str, transcript: str):
-    summary = summarize_meeting(meeting_id, transcript)
-    decisions = extract_decisions(meeting_id, transcript)
+# Shared pool: summary and decisions are independent LLM calls, so they
+# run at the same time (wall time = slowest stage, not the sum).
+_executor = ThreadPoolExecutor(
+    max_workers=config.PIPELINE_MAX_WORKERS,
+    thread_name_prefix="ai-pipeline",
+)
+
+
+def _wait(future, stage: str, errors: dict, deadline: float = None):
+    started = time.monotonic()
+    timeout = config.STAGE_TIMEOUT_SECONDS
+    if deadline is not None:
+        timeout = max(0.0, deadline - started)
+
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        # a call still queued gives its pool slot back; one already running
+        # can't be interrupted and finishes in the background
+        future.cancel()
+        waited = time.monotonic() - started
+        if deadline is not None:
+            errors[stage] = f"timed out after {waited:.1f}s (shared {config.STAGE_TIMEOUT_SECONDS}s deadline)"
+        else:
+            errors[stage] = f"timed out after {waited:.1f}s"
+    except Exception as e:
+        errors[stage] = str(e) or e.__class__.__name__
+    return None
+
+
+def _single_pass(meeting_id: str, transcript: str, errors: dict):
+    summary_future = _executor.submit(summarize_meeting, meeting_id, transcript)
+    decisions_future = _executor.submit(extract_decisions, meeting_id, transcript)
+
+    summary = _wait(summary_future, "summary", errors)
+    decisions = _wait(decisions_future, "decisions", errors)
+
+    return (
+        summary,
+        decisions["output"] if decisions else None,
+    )
+
+
+def _combined_pass(meeting_id: str, transcript: str, errors: dict):
+    """
+    One structured call for both outputs; a failure fails both stages.
+    """
+    stage_errors = {}
+    result = _wait(_executor.submit(analyze_meeting, meeting_id, transcript), "combined", stage_errors)
+    if result is None:
+        errors["summary"] = errors["decisions"] = stage_errors["combined"]
+        return None, None
+
+    return result, result["output"]
+
+
+def _map_reduce(meeting_id: str, chunks: list, errors: dict, mode: str):
+    """
+    Long transcripts: summarise + extract every chunk in parallel (map),
+    then merge the partial summaries with one more call and merge the
+    decisions locally (reduce). Combined mode: one call per chunk.
+    """
+    total = len(chunks)
+    deadline = time.monotonic() + config.STAGE_TIMEOUT_SECONDS
+    partials = []
+    outputs = []
+
+    if mode == "combined":
+        futures = [
+            _executor.submit(analyze_meeting, meeting_id, chunk, (i, total))
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+        for i, future in enumerate(futures, start=1):
+            result = _wait(future, f"combined[{i}/{total}]", errors, deadline)
+            if result:
+                partials.append(result["summary"])
+                outputs.append(result["output"])
+    else:
+        summary_futures = [
+            _executor.submit(summarize_chunk, meeting_id, chunk, i, total)
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+        decision_futures = [
+            _executor.submit(extract_decisions, meeting_id, chunk)
+            for chunk in chunks
+        ]
+
+        for i, future in enumerate(summary_futures, start=1):
+            text = _wait(future, f"summary[{i}/{total}]", errors, deadline)
+            if text:
+                partials.append(text)
+
+        for i, future in enumerate(decision_futures, start=1):
+            result = _wait(future, f"decisions[{i}/{total}]", errors, deadline)
+            if result:
+                outputs.append(result["output"])
+
+    summary = None
+    if partials:
+        summary = _wait(_executor.submit(merge_summaries, meeting_id, partials), "summary", errors)
+    else:
+        errors["summary"] = "all chunks failed"
+
+    decisions = None
+    if outputs:
+        decisions = merge_outputs(outputs)
+    else:
+        errors["decisions"] = "all chunks failed"
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return summary, decisions
+
+
+def _prepare(meeting_id: str, transcript: str):
+    """
+    Pre-compress the transcript (deterministic, no LLM) before chunking.
+    Returns (text, stats or None); the ratio is recorded as a "compress" row
+    (prompt_tokens = before, completion_tokens = after).
+    """
+    if not config.COMPRESS_TRANSCRIPT:
+        return transcript, None
+
+    start = time.perf_counter()
+    compressed, stats = compress_transcript(transcript)
+    if not compressed.strip():
+        # nothing left (e.g. only timestamps): keep the original text
+        return transcript, None
+
+    metrics.record(
+        "compress",
+        meeting_id,
+        prompt_tokens=stats["tokens_in"],
+        completion_tokens=stats["tokens_out"],
+        latency=time.perf_counter() - start,
+    )
+    return compressed, stats
+
+
+def build_output(meeting_id: str, transcript: str, mode: str = None) -> dict:
+    """
+    Run the pipeline and return the output dict (nothing is written).
+    mode: "split" | "combined" (default: config.PIPELINE_MODE)
+    """
+    mode = mode or config.PIPELINE_MODE
+    # partial results: a failed/slow stage does not discard the other one
+    errors = {}
+
+    with metrics.timed("pipeline", meeting_id) as info:
+        transcript, compression = _prepare(meeting_id, transcript)
+        chunks = split_transcript(transcript)
+        if len(chunks) > 1:
+            summary, decisions = _map_reduce(meeting_id, chunks, errors, mode)
+        elif mode == "combined":
+            summary, decisions = _combined_pass(meeting_id, transcript, errors)
+        else:
+            summary, decisions = _single_pass(meeting_id, transcript, errors)
+
+        if errors:
+            info["ok"] = False
+            info["error"] = "; ".join(f"{k}: {v}" for k, v in errors.items())
 
     output = {
         "meeting_id": meeting_id,
-        "summary": summary["summary"],
-        "decisions": decisions["output"],
-        "created_at": summary["created_at"]
+        "summary": summary["summary"] if summary else "",
+        "decisions": decisions if decisions is not None else empty_output(),
+        "created_at": summary["created_at"] if summary else datetime.utcnow().isoformat()
     }
+    if len(chunks) > 1:
+        output["chunks"] = len(chunks)
+    if compression:
+        output["compression"] = compression
+    if errors:
+        output["errors"] = errors
+    return output
 
-    with open(f"{OUTPUT_DIR}/{meeting_id}.json", "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
 
-    return output
+def run_pipeline(meeting_id: str, transcript: str):
+    """
+    Kept for callers of the package API. Results are persisted only as
+    AIOutput rows (service.py); file dumps: `manage.py export_ai_outputs`.
+    """
+    return build_output(meeting_id, transcript)
+
+
+def stream_pipeline_summary(meeting_id: str, transcript: str):
+    """
+    Summary only, streamed: yields text deltas.
+    Long transcripts still summarise their chunks in parallel first;
+    only the final merge is streamed.
+    """
+    transcript, _ = _prepare(meeting_id, transcript)
+    chunks = split_transcript(transcript)
+    if len(chunks) <= 1:
+        yield from stream_summary(meeting_id, transcript)
+        return
+
+    errors = {}
+    total = len(chunks)
+    deadline = time.monotonic() + config.STAGE_TIMEOUT_SECONDS
+    futures = [
+        _executor.submit(summarize_chunk, meeting_id, chunk, i, total)
+        for i, chunk in enumerate(chunks, start=1)
+    ]
+
+    partials = []
+    for i, future in enumerate(futures, start=1):
+        text = _wait(future, f"summary[{i}/{total}]", errors, deadline)
+        if text:
+            partials.append(text)
+
+    if not partials:
+        raise RuntimeError("; ".join(f"{k}: {v}" for k, v in errors.items()))
+
+    yield from stream_merged_summary(meeting_id, partials)
@@ -0,0 +1,138 @@
+"""
+Typed decision-extraction output.
+
+The extractor asks the model for JSON constrained by DECISIONS_SCHEMA
+(structured outputs), validates it once into DecisionOutput, and only the
+validated dict (to_dict) is passed on / stored in AIOutput.decisions_json.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+PRIORITIES = ("low", "medium", "high")
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+DECISIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "decisions": _STRING_LIST,
+        "action_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "assignee": _NULLABLE_STRING,
+                    "due_date": _NULLABLE_STRING,
+                    "priority": {"type": "string", "enum": list(PRIORITIES)},
+                },
+                "required": ["title", "assignee", "due_date", "priority"],
+                "additionalProperties": False,
+            },
+        },
+        "risks": _STRING_LIST,
+        "notes": _STRING_LIST,
+    },
+    "required": ["decisions", "action_items", "risks", "notes"],
+    "additionalProperties": False,
+}
+
+# chat.completions response_format for schema-constrained decoding
+DECISIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "meeting_decisions",
+        "strict": True,
+        "schema": DECISIONS_SCHEMA,
+    },
+}
+
+
+def _text(value) -> str:
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def _optional(value) -> Optional[str]:
+    value = _text(value)
+    return value or None
+
+
+def _strings(values) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [s for s in (_text(v) for v in values if isinstance(v, (str, int, float))) if s]
+
+
+@dataclass
+class ActionItem:
+    title: str
+    assignee: Optional[str] = None
+    due_date: Optional[str] = None
+    priority: str = "medium"
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        None if the item has no usable title.
+        """
+        if not isinstance(data, dict):
+            return None
+
+        title = _text(data.get("title"))
+        if not title:
+            return None
+
+        priority = _text(data.get("priority")).lower()
+        return cls(
+            title=title,
+            assignee=_optional(data.get("assignee")),
+            due_date=_optional(data.get("due_date")),
+            priority=priority if priority in PRIORITIES else "medium",
+        )
+
+
+@dataclass
+class DecisionOutput:
+    decisions: List[str] = field(default_factory=list)
+    action_items: List[ActionItem] = field(default_factory=list)
+    risks: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Validate model output. Unknown keys are dropped, wrong types become
+        empty lists, invalid action items are skipped.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Decision output must be a JSON object.")
+
+        items = (ActionItem.from_dict(i) for i in data.get("action_items") or [])
+        return cls(
+            decisions=_strings(data.get("decisions")),
+            action_items=[i for i in items if i is not None],
+            risks=_strings(data.get("risks")),
+            notes=_strings(data.get("notes")),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# combined mode: summary + decisions in one request (see combined.py)
+MINUTES_SCHEMA = {
+    **DECISIONS_SCHEMA,
+    "properties": {"summary": {"type": "string"}, **DECISIONS_SCHEMA["properties"]},
+    "required": ["summary", *DECISIONS_SCHEMA["required"]],
+}
+
+MINUTES_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "meeting_minutes",
+        "strict": True,
+        "schema": MINUTES_SCHEMA,
+    },
+}
@@ -1,14 +1,110 @@
 from typing import Dict, Any
 
-def run_ai(meeting_id: str, minutes_text: str) -> Dict[str, Any]:
+
+def _cached_output(key: str):
+    from minutes.models import AIOutput
+
+    return (
+        AIOutput.objects
+        .filter(content_hash=key)
+        .order_by("-generated_at")
+        .first()
+    )
+
+
+def _store_output(meeting_id: str, key: str, result: dict):
+    """
+    Persist the stages that succeeded. The row only keeps `key` as its
+    cache key when it is complete for that text (a failed stage under a
+    different key would otherwise be served stale from the cache).
+
+    Atomic upsert: the row is locked while it is merged, so two workers
+    generating the same meeting cannot overwrite each other's stages.
+    """
+    from django.db import transaction
+    from minutes.models import AIOutput
+    from . import config
+
+    if not str(meeting_id).isdigit():
+        return
+
+    errors = result.get("errors") or {}
+    with transaction.atomic():
+        output, _ = (
+            AIOutput.objects
+            .select_for_update()
+            .get_or_create(meeting_id=int(meeting_id))
+        )
+
+        if "summary" not in errors:
+            output.summary_text = result.get("summary", "")
+        if "decisions" not in errors:
+            output.decisions_json = result.get("decisions") or {}
+
+        if not errors:
+            output.content_hash = key
+        elif output.content_hash != key:
+            output.content_hash = ""
+
+        output.model_name = config.MODEL_NAME
+        output.pipeline_version = config.PROMPT_VERSION
+        output.save()
+
+
+def cached_ai(meeting_id: str, minutes_text: str):
+    """
+    Cached result for this text (same shape as run_ai) or None.
+    Cheap (one indexed query), so views can answer instantly on a hit.
+    """
+    minutes_text = (minutes_text or "").strip()
+    if not minutes_text:
+        return None
+
+    from .cache import cache_key
+
+    key = cache_key(minutes_text)
+    cached = _cached_output(key)
+    if cached is None:
+        return None
+
+    from . import metrics
+
+    metrics.record("cache", meeting_id, cached=True)
+    metrics.flush()
+
+    if str(cached.meeting_id) != str(meeting_id):
+        _store_output(meeting_id, key, {
+            "summary": cached.summary_text,
+            "decisions": cached.decisions_json,
+        })
+
+    return {
+        "summary": cached.summary_text,
+        "decisions": cached.decisions_json,
+        "errors": {},
+        "cached": True,
+    }
+
+
+def run_ai(meeting_id: str, minutes_text: str, force: bool = False) -> Dict[str, Any]:
     """
     WARF unified AI interface
+    - Results are cached in AIOutput by content hash (transcript + model
+      settings + prompt version); force=True always calls the LLM.
     """
 
     minutes_text = (minutes_text or "").strip()
     if not minutes_text:
         return {"summary": "", "decisions": []}
 
+    from . import metrics
+
+    if not force:
+        cached = cached_ai(meeting_id, minutes_text)
+        if cached is not None:
+            return cached
+
+    from .cache import cache_key
     from .pipeline import run_pipeline
 
     result = run_pipeline(
@@ -16,7 +112,47 @@ def run_ai(meeting_id: str, minutes_text: str) -> Dict[str, Any]:
         transcript=minutes_text
     )
 
+    errors = result.get("errors", {})
+    # partial results are stored but never used as a cache hit
+    _store_output(meeting_id, cache_key(minutes_text), result)
+    metrics.flush()
+
     return {
         "summary": result.get("summary", ""),
         "decisions": result.get("decisions", []),
+        "errors": errors,
+        "cached": False,
     }
+
+
+def stream_ai_summary(meeting_id: str, minutes_text: str, force: bool = False):
+    """
+    Generator of summary text deltas (for server-sent events).
+    A cache hit yields the stored summary at once; otherwise the final
+    text is written to AIOutput when the stream completes.
+    """
+    minutes_text = (minutes_text or "").strip()
+    if not minutes_text:
+        return
+
+    from . import metrics
+
+    if not force:
+        cached = cached_ai(meeting_id, minutes_text)
+        if cached is not None:
+            yield cached["summary"]
+            return
+
+    from .cache import cache_key
+    from .pipeline import stream_pipeline_summary
+
+    parts = []
+    for delta in stream_pipeline_summary(str(meeting_id), minutes_text):
+        parts.append(delta)
+        yield delta
+
+    _store_output(meeting_id, cache_key(minutes_text), {
+        "summary": "".join(parts),
+        "errors": {"decisions": "not regenerated"},
+    })
+    metrics.flush()
@@ -1,8 +1,6 @@
-from openai import OpenAI
 from datetime import datetime
 from . import config
-
-client = OpenAI()
+from .backends import get_backend
 
 SYSTEM_PROMPT = (
     "You are an AI meeting assistant.\n"
@@ -13,19 +11,114 @@ SYSTEM_PROMPT = (
     "Limit the summary to 5–7 bullet points or a short paragraph."
 )
 
+CHUNK_PROMPT = (
+    "You are an AI meeting assistant.\n"
+    "You are given one part of a longer meeting transcript.\n"
+    "Write concise bullet points covering the discussion points in this part only.\n"
+    "Do NOT include action items, decisions, or risks."
+)
+
+MERGE_PROMPT = (
+    SYSTEM_PROMPT + "\n"
+    "You are given partial summaries of consecutive parts of ONE meeting. "
+    "Merge them into a single summary without repeating points."
+)
+
+
+def summarize_chunk(meeting_id: str, chunk: str, index: int, total: int) -> str:
+    """
+    Map step: partial summary of one transcript chunk.
+    """
+    return get_backend().complete(
+        messages=[
+            {"role": "system", "content": CHUNK_PROMPT},
+            {"role": "user", "content": f"Part {index} of {total}:\n\n{chunk}"},
+        ],
+        temperature=config.TEMPERATURE_SUMMARY,
+        max_tokens=config.MAX_TOKENS_CHUNK_SUMMARY,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="summary_chunk",
+        meeting_id=meeting_id,
+    )
+
+
+def merge_summaries(meeting_id: str, partials: list) -> dict:
+    """
+    Reduce step: one summary from the per-chunk summaries.
+    """
+    joined = "\n\n".join(f"Part {i}:\n{p}" for i, p in enumerate(partials, start=1))
+
+    text = get_backend().complete(
+        messages=[
+            {"role": "system", "content": MERGE_PROMPT},
+            {"role": "user", "content": joined},
+        ],
+        temperature=config.TEMPERATURE_SUMMARY,
+        max_tokens=config.MAX_TOKENS_SUMMARY_MERGED,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="summary_merge",
+        meeting_id=meeting_id,
+    )
+
+    return {
+        "meeting_id": meeting_id,
+        "summary": text,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+
 def summarize_meeting(meeting_id: str, transcript: str) -> dict:
-    response = client.chat.completions.create(
-        model=config.MODEL_NAME,
+    text = get_backend().complete(
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": transcript},
         ],
         temperature=config.TEMPERATURE_SUMMARY,
         max_tokens=config.MAX_TOKENS_SUMMARY,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="summary",
+        meeting_id=meeting_id,
     )
 
     return {
         "meeting_id": meeting_id,
-        "summary": response.choices[0].message.content,
+        "summary": text,
         "created_at": datetime.utcnow().isoformat(),
     }
+
+
+def stream_summary(meeting_id: str, transcript: str):
+    """
+    Same call as summarize_meeting, streamed: yields text deltas
+    as the model produces them.
+    """
+    yield from get_backend().stream(
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": transcript},
+        ],
+        temperature=config.TEMPERATURE_SUMMARY,
+        max_tokens=config.MAX_TOKENS_SUMMARY,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="summary_stream",
+        meeting_id=meeting_id,
+    )
+
+
+def stream_merged_summary(meeting_id: str, partials: list):
+    """
+    Streaming version of merge_summaries (reduce step).
+    """
+    joined = "\n\n".join(f"Part {i}:\n{p}" for i, p in enumerate(partials, start=1))
+
+    yield from get_backend().stream(
+        messages=[
+            {"role": "system", "content": MERGE_PROMPT},
+            {"role": "user", "content": joined},
+        ],
+        temperature=config.TEMPERATURE_SUMMARY,
+        max_tokens=config.MAX_TOKENS_SUMMARY_MERGED,
+        timeout=config.STAGE_TIMEOUT_SECONDS,
+        stage="summary_stream",
+        meeting_id=meeting_id,
+    )
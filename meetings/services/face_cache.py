@@ -0,0 +1,79 @@
+"""
+Reuse a recent face verification across meetings.
+
+The result is kept in the user's session (= this user on this device /
+browser), so a user attending back-to-back meetings verifies once per
+FACE_VERIFY_TTL_MINUTES instead of once per meeting. Only results with
+confidence >= FACE_VERIFY_CACHE_MIN_CONFIDENCE are reused.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+SESSION_KEY = "face_verification"
+
+
+def _ttl():
+    return timedelta(minutes=getattr(settings, "FACE_VERIFY_TTL_MINUTES", 120))
+
+
+def _min_confidence():
+    return getattr(settings, "FACE_VERIFY_CACHE_MIN_CONFIDENCE", 0.75)
+
+
+def remember(request, confidence, verified_at=None):
+    """
+    Store a successful verification for this user + session.
+    verified_at: when the face was actually checked (default: now).
+    """
+    try:
+        confidence = float(confidence)
+    except (TypeError, ValueError):
+        return
+
+    if confidence < _min_confidence():
+        return
+
+    request.session[SESSION_KEY] = {
+        "user_id": request.user.pk,
+        "confidence": confidence,
+        "verified_at": (verified_at or timezone.now()).isoformat(),
+    }
+
+
+def recall(request):
+    """
+    Confidence of a still-valid cached verification, or None.
+    """
+    data = request.session.get(SESSION_KEY)
+    if not isinstance(data, dict) or data.get("user_id") != request.user.pk:
+        return None
+
+    verified_at = parse_datetime(data.get("verified_at") or "")
+    if verified_at is None or timezone.now() - verified_at > _ttl():
+        request.session.pop(SESSION_KEY, None)
+        return None
+
+    confidence = data.get("confidence")
+    if confidence is None or confidence < _min_confidence():
+        return None
+    return confidence
+
+
+def apply_cached(request, meeting):
+    """
+    If the session holds a valid verification, mark this meeting's
+    attendee as verified (no inference) and return the confidence.
+    """
+    confidence = recall(request)
+    if confidence is None:
+        return None
+
+    from meetings.services.face_queue import record_verification
+
+    record_verification(meeting, request.user, confidence)
+    request.session[f"face_verified_meeting_{meeting.id}"] = True
+    return confidence
@@ -0,0 +1,232 @@
+"""
+DB-backed face verification queue.
+
+- verify_face_api enqueues the frame and returns a ticket (job id).
+- `manage.py run_face_verifier` runs a bounded pool of worker threads.
+- One pending job per (meeting, user): a newer frame replaces the old one.
+- Meetings with fewer jobs in progress are served first (fairness).
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from meetings.models import Attendee, FaceVerificationJob
+
+STALE_AFTER = timedelta(minutes=2)   # running job with a dead worker -> pending again
+RESULT_TTL = timedelta(hours=1)      # finished jobs are deleted after this
+CLAIM_WINDOW = 50
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _max_pending():
+    return getattr(settings, "FACE_QUEUE_MAX_PENDING", 200)
+
+
+# -------------------------
+# Results
+# -------------------------
+def record_verification(meeting, user, confidence=None):
+    """
+    Mark the attendee as face-verified for this meeting.
+    """
+    attendee, _ = Attendee.objects.get_or_create(
+        meeting=meeting,
+        user=user,
+        defaults={"role": "member"}
+    )
+    attendee.face_verified = True
+    attendee.face_verified_at = timezone.now()
+
+    if confidence is not None:
+        try:
+            attendee.confidence = float(confidence)
+        except Exception:
+            pass
+
+    attendee.save(update_fields=["face_verified", "face_verified_at", "confidence"])
+    return attendee
+
+
+# -------------------------
+# Producer
+# -------------------------
+def enqueue(meeting, user, frame: bytes) -> FaceVerificationJob:
+    """
+    Queue a frame for (meeting, user). Raises QueueFull when the
+    backlog is already at FACE_QUEUE_MAX_PENDING.
+    """
+    with transaction.atomic():
+        job = _replace_pending_frame(meeting, user, frame)
+        if job is not None:
+            return job
+
+        pending = FaceVerificationJob.objects.filter(status=FaceVerificationJob.STATUS_PENDING).count()
+        if pending >= _max_pending():
+            raise QueueFull()
+
+        try:
+            with transaction.atomic():
+                return FaceVerificationJob.objects.create(meeting=meeting, user=user, image=frame)
+        except IntegrityError:
+            # a concurrent request queued the same (meeting, user) first:
+            # one pending job per pair (meetings_face_job_one_pending)
+            job = _replace_pending_frame(meeting, user, frame)
+            if job is None:
+                raise
+            return job
+
+
+def _replace_pending_frame(meeting, user, frame: bytes):
+    """
+    Put the newest frame on the pending job of (meeting, user), if any.
+    Its place in the queue is kept.
+    """
+    job = (
+        FaceVerificationJob.objects
+        .select_for_update()
+        .filter(meeting=meeting, user=user, status=FaceVerificationJob.STATUS_PENDING)
+        .first()
+    )
+    if job is not None:
+        job.image = frame
+        job.save(update_fields=["image"])
+    return job
+
+
+# -------------------------
+# Consumer
+# -------------------------
+def claim_next():
+    """
+    Atomically move one pending job to running and return it (or None).
+    """
+    pending = list(
+        FaceVerificationJob.objects
+        .filter(status=FaceVerificationJob.STATUS_PENDING)
+        .order_by("created_at")
+        .values_list("id", "meeting_id")[:CLAIM_WINDOW]
+    )
+    if not pending:
+        return None
+
+    running = dict(
+        FaceVerificationJob.objects
+        .filter(status=FaceVerificationJob.STATUS_RUNNING)
+        .values("meeting_id")
+        .annotate(n=Count("id"))
+        .values_list("meeting_id", "n")
+    )
+
+    # stable sort: fewest in-progress jobs per meeting first, then oldest
+    pending.sort(key=lambda row: running.get(row[1], 0))
+
+    for job_id, _ in pending:
+        claimed = (
+            FaceVerificationJob.objects
+            .filter(pk=job_id, status=FaceVerificationJob.STATUS_PENDING)
+            .update(status=FaceVerificationJob.STATUS_RUNNING, started_at=timezone.now())
+        )
+        if claimed:
+            return FaceVerificationJob.objects.select_related("meeting", "user").get(pk=job_id)
+
+    return None
+
+
+def process(job: FaceVerificationJob):
+    from accounts.services.faceREC.face import verify_user_face
+    from accounts.services.faceREC.images import decode_image
+
+    status = FaceVerificationJob.STATUS_DONE
+    try:
+        image = decode_image(bytes(job.image))
+        result = verify_user_face(image, job.user) or {}
+    except ValueError:
+        result = {"approved": False, "message": "No face detected. Please face the camera and retry."}
+    except Exception:
+        status = FaceVerificationJob.STATUS_FAILED
+        result = {"approved": False, "message": "Verification error. Please retry."}
+
+    job.approved = bool(result.get("approved"))
+    job.confidence = result.get("confidence")
+    job.message = (result.get("message") or ("Verified" if job.approved else "Verification failed"))[:255]
+    job.status = status
+    job.finished_at = timezone.now()
+    job.image = b""  # frame is not kept after verification
+    job.save(update_fields=["approved", "confidence", "message", "status", "finished_at", "image"])
+
+    if job.approved:
+        record_verification(job.meeting, job.user, job.confidence)
+
+    return job
+
+
+def housekeeping():
+    now = timezone.now()
+
+    stale = FaceVerificationJob.objects.filter(
+        status=FaceVerificationJob.STATUS_RUNNING,
+        started_at__lt=now - STALE_AFTER,
+    ).values_list("id", flat=True)
+    for job_id in list(stale):
+        try:
+            with transaction.atomic():
+                FaceVerificationJob.objects.filter(pk=job_id, status=FaceVerificationJob.STATUS_RUNNING).update(
+                    status=FaceVerificationJob.STATUS_PENDING, started_at=None
+                )
+        except IntegrityError:
+            # a newer frame is already pending for this (meeting, user)
+            FaceVerificationJob.objects.filter(pk=job_id).update(
+                status=FaceVerificationJob.STATUS_FAILED,
+                message="Superseded by a newer frame",
+                finished_at=now,
+                image=b"",
+            )
+
+    FaceVerificationJob.objects.filter(
+        status__in=[FaceVerificationJob.STATUS_DONE, FaceVerificationJob.STATUS_FAILED],
+        finished_at__lt=now - RESULT_TTL,
+    ).delete()
+
+
+def _worker_loop(stop: threading.Event, poll_interval: float):
+    while not stop.is_set():
+        close_old_connections()
+        job = claim_next()
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+        process(job)
+
+
+def run_workers(workers: int = 2, poll_interval: float = 0.5, log=print):
+    """
+    Run `workers` verification threads until interrupted.
+    Throughput is capped by this number, not by web traffic.
+    """
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_worker_loop, args=(stop, poll_interval), daemon=True)
+        for _ in range(max(1, workers))
+    ]
+    for t in threads:
+        t.start()
+    log(f"Face verifier running with {len(threads)} worker(s)")
+
+    try:
+        while True:
+            housekeeping()
+            close_old_connections()
+            time.sleep(30)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join(timeout=5)
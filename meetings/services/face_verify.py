@@ -1,15 +1,14 @@
-from deepface import DeepFace
+from accounts.services.faceREC import model_service
+from accounts.services.faceREC.face import THRESHOLD
+
 
 def verify_face(reference_img_path: str, selfie_img_path: str):
-    result = DeepFace.verify(
-        img1_path=reference_img_path,
-        img2_path=selfie_img_path,
-        enforce_detection=True,
-        detector_backend="opencv",
-        model_name="VGG-Face",
-        distance_metric="cosine"
+    # Same warm ArcFace model as accounts face verification
+    result = model_service.verify(
+        reference_img_path,
+        selfie_img_path,
+        threshold=THRESHOLD
     )
     is_match = bool(result.get("verified", False))
-    distance = float(result.get("distance", 999.0))
-    confidence = max(0.0, 1.0 - distance)
+    confidence = max(0.0, float(result.get("similarity", 0.0)))
     return is_match, confidence
@@ -10,6 +10,7 @@ urlpatterns = [
     path("<int:pk>/", views.meeting_detail, name="detail"),
     path("<int:pk>/join/", views.join_meeting, name="join"),
     path("<int:pk>/verify-face/", views.verify_face_api, name="verify_face"),
+    path("<int:pk>/verify-face/<int:ticket>/", views.verify_face_status, name="verify_face_status"),
 
     # Upload transcript (text) for upload-only / both
     path("<int:pk>/upload/", views.upload_transcript, name="upload_transcript"),
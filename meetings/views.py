@@ -1,14 +1,17 @@
-import os, uuid, base64
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponseForbidden
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
-from django.views.decorators.http import require_POST
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
 from django.db.models import Q
 from .forms import MeetingCreateForm
-from accounts.services.faceREC.face import verify_face, FACE_DB
-from .models import Meeting, Attendee
+from accounts.services.faceREC.face import verify_user_face
+from accounts.services.faceREC.images import decode_data_url, encode_jpeg
+from accounts.services.faceREC.quality import check_frame
+from .models import Meeting, Attendee, FaceVerificationJob
+from .services import face_cache, face_queue
 from django.contrib import messages
 
 
@@ -156,8 +159,10 @@ def join_meeting(request, pk):
             "message": meeting.open_status_message(),
         }, status=403)
 
-    # 4) Face gate (session-based)
+    # 4) Face gate (session-based, reuses a recent verification from another meeting)
     face_verified = _has_face_session(meeting.id, request)
+    if not face_verified and meeting.require_face_verification:
+        face_verified = face_cache.apply_cached(request, meeting) is not None
 
     jitsi_domain = (meeting.jitsi_domain or "").strip() or "meet.jit.si"
 
@@ -189,61 +194,99 @@ def verify_face_api(request, pk):
     if not meeting.is_open_now():
         return JsonResponse({"approved": False, "message": meeting.open_status_message()}, status=403)
 
+    # recently verified (same user + session) -> no inference
+    cached = face_cache.apply_cached(request, meeting)
+    if cached is not None:
+        return JsonResponse({
+            "approved": True,
+            "message": "Verified",
+            "details": {"confidence": cached, "cached": True}
+        })
+
     image_data = request.POST.get("image_data", "")
     if not image_data.startswith("data:image"):
         return JsonResponse({"approved": False, "message": "No image received."}, status=400)
 
-    # decode base64
+    # decode base64 straight into an array (no temp file)
     try:
-        _, encoded = image_data.split(",", 1)
-        img_bytes = base64.b64decode(encoded)
-    except Exception:
+        image = decode_data_url(image_data)
+    except ValueError:
         return JsonResponse({"approved": False, "message": "Invalid image format."}, status=400)
 
-    # save temp file
-    temp_dir = os.path.join(settings.MEDIA_ROOT, "temp")
-    os.makedirs(temp_dir, exist_ok=True)
-    filename = f"{uuid.uuid4().hex}.jpg"
-    temp_path = os.path.join(temp_dir, filename)
-
-    with open(temp_path, "wb") as f:
-        f.write(img_bytes)
-
-    authorized = list(FACE_DB.keys())
-    result = verify_face(temp_path, authorized) or {}
+    # cheap quality gate: unusable frames never reach the model
+    quality = check_frame(image)
+    if not quality["ok"]:
+        return JsonResponse({
+            "approved": False,
+            "message": quality["hints"][0],
+            "hints": quality["hints"],
+            "quality": quality["scores"],
+        })
+
+    if settings.FACE_VERIFY_QUEUE:
+        # queued: the worker pool (run_face_verifier) runs the model,
+        # this request returns a ticket immediately
+        try:
+            job = face_queue.enqueue(meeting, request.user, encode_jpeg(image))
+        except face_queue.QueueFull:
+            return JsonResponse({
+                "approved": False,
+                "message": "Many people are verifying right now. Please retry in a few seconds."
+            }, status=429)
+
+        return JsonResponse({
+            "approved": False,
+            "queued": True,
+            "ticket": job.id,
+            "poll_url": reverse("meetings:verify_face_status", args=[meeting.id, job.id]),
+            "message": "Verifying…",
+        }, status=202)
 
     try:
-        os.remove(temp_path)
-    except Exception:
-        pass
+        # 1:1: is this the logged-in attendee? (no company-wide search)
+        result = verify_user_face(image, request.user) or {}
+    except ValueError:
+        # DeepFace raises when no face is detected in the frame
+        result = {"approved": False, "message": "No face detected. Please face the camera and retry."}
 
     approved = bool(result.get("approved"))
 
     if approved:
-        attendee, _ = Attendee.objects.get_or_create(
-            meeting=meeting,
-            user=request.user,
-            defaults={"role": "member"}
-        )
-        attendee.face_verified = True
-        attendee.face_verified_at = timezone.now()
-
-        conf = result.get("confidence")
-        if conf is not None:
-            try:
-                attendee.confidence = float(conf)
-            except Exception:
-                pass
-
-        attendee.save(update_fields=["face_verified", "face_verified_at", "confidence"])
-
+        face_queue.record_verification(meeting, request.user, result.get("confidence"))
         request.session[f"face_verified_meeting_{meeting.id}"] = True
+        face_cache.remember(request, result.get("confidence"))
 
     return JsonResponse({
         "approved": approved,
         "message": result.get("message", "Verified" if approved else "Verification failed"),
         "details": result
     })
+
+
+@require_GET
+@login_required
+def verify_face_status(request, pk, ticket):
+    """
+    Poll a queued verification (ticket returned by verify_face_api).
+    """
+    job = get_object_or_404(FaceVerificationJob, pk=ticket, meeting_id=pk, user=request.user)
+
+    if not job.is_finished:
+        return JsonResponse({"approved": False, "pending": True, "status": job.status})
+
+    if job.approved:
+        request.session[f"face_verified_meeting_{pk}"] = True
+        # the job's own time: polling the same ticket again must not extend the TTL
+        face_cache.remember(request, job.confidence, verified_at=job.finished_at)
+
+    return JsonResponse({
+        "approved": job.approved,
+        "pending": False,
+        "message": job.message,
+        "details": {"confidence": job.confidence},
+    })
+
+
 @login_required
 def upload_transcript(request, pk):
     meeting = get_object_or_404(Meeting, pk=pk)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Minutes
+from .models import AICallLog, Minutes
 from tasks.models import Task
 from records.models import Record
 
@@ -43,3 +43,21 @@ class MinutesAdmin(admin.ModelAdmin):
             obj.created_by = request.user
         obj.save()
      formset.save_m2m()
+
+
+@admin.register(AICallLog)
+class AICallLogAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at", "stage", "meeting", "model_name",
+        "prompt_tokens", "completion_tokens", "latency_ms", "retries", "cached", "ok",
+    )
+    list_filter = ("stage", "ok", "cached", "backend", "model_name", "created_at")
+    search_fields = ("meeting__title", "error")
+    date_hierarchy = "created_at"
+    list_select_related = ("meeting",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,192 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from meetings.models import Meeting
+from meetings.services.ai_meeting_engine import config
+from meetings.services.ai_meeting_engine.cache import cache_key
+from meetings.services.ai_meeting_engine.service import run_ai
+from minutes.models import AIOutput, Minutes
+from minutes.services.ai_jobs import apply_ai_result
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return timezone.make_aware(datetime.strptime(value, "%Y-%m-%d"))
+    except ValueError:
+        raise CommandError(f"Invalid date (expected YYYY-MM-DD): {value}")
+
+
+def _load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return {"done": {}, "failed": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path, state):
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _process(meeting_id: int, text: str, force: bool):
+    """
+    Runs in a worker thread: pipeline -> AIOutput (run_ai) -> Minutes.
+    Returns the error string or "".
+    """
+    try:
+        result = run_ai(str(meeting_id), text, force=force)
+
+        minutes_obj = Minutes.objects.filter(meeting_id=meeting_id).first()
+        if minutes_obj is not None and not minutes_obj.is_locked:
+            apply_ai_result(minutes_obj, result)
+
+        errors = result.get("errors") or {}
+        return "; ".join(f"{k}: {v}" for k, v in errors.items())
+    except Exception as e:
+        return str(e) or e.__class__.__name__
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Generate AI summary/decisions for meetings whose AIOutput is missing or stale"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Meetings scheduled on/after YYYY-MM-DD")
+        parser.add_argument("--until", help="Meetings scheduled before YYYY-MM-DD")
+        parser.add_argument("--limit", type=int, default=0)
+        parser.add_argument("--workers", type=int, default=4, help="Meetings processed at the same time")
+        parser.add_argument("--rpm", type=int, default=config.LLM_REQUESTS_PER_MINUTE, help="Requests/min budget (0 = unlimited)")
+        parser.add_argument("--tpm", type=int, default=config.LLM_TOKENS_PER_MINUTE, help="Tokens/min budget (0 = unlimited)")
+        parser.add_argument(
+            "--stage-timeout",
+            type=int,
+            default=300,
+            help="Per-stage timeout in seconds (calls may wait for the rate budget)"
+        )
+        parser.add_argument("--checkpoint", default="ai_backfill.checkpoint.json")
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry meetings that failed in the checkpoint")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help=(
+                "Regenerate even if AIOutput is up to date, including meetings with approved (locked) "
+                "minutes; the minutes themselves are never changed (use a new --checkpoint for each forced run)"
+            )
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def _candidates(self, options, state):
+        meetings = Meeting.objects.order_by("scheduled_at", "id")
+        since = _parse_date(options["since"])
+        until = _parse_date(options["until"])
+        if since:
+            meetings = meetings.filter(scheduled_at__gte=since)
+        if until:
+            meetings = meetings.filter(scheduled_at__lt=until)
+
+        points = dict(Minutes.objects.values_list("meeting_id", "discussion_points"))
+        # approved minutes are final: don't spend LLM calls on them unless forced
+        locked = set() if options["force"] else set(
+            Minutes.objects.filter(is_locked=True).values_list("meeting_id", flat=True)
+        )
+        hashes = dict(AIOutput.objects.values_list("meeting_id", "content_hash"))
+        done = state["done"]
+        failed = set(state["failed"]) if not options["retry_failed"] else set()
+
+        for meeting_id, transcript in meetings.values_list("id", "transcript_text"):
+            if meeting_id in locked:
+                continue
+            # same text the minutes page sends (manual minutes first)
+            text = (points.get(meeting_id) or transcript or "").strip()
+            if not text:
+                continue
+
+            key = str(meeting_id)
+            digest = cache_key(text)
+            # done in this checkpoint (also under --force) / given up on
+            if done.get(key) == digest or key in failed:
+                continue
+            if not options["force"] and hashes.get(meeting_id) == digest:
+                continue
+
+            yield meeting_id, text
+
+    def handle(self, *args, **options):
+        # the rate limiter in backends.py reads these for every call
+        config.LLM_REQUESTS_PER_MINUTE = max(0, options["rpm"])
+        config.LLM_TOKENS_PER_MINUTE = max(0, options["tpm"])
+        config.STAGE_TIMEOUT_SECONDS = max(config.STAGE_TIMEOUT_SECONDS, options["stage_timeout"])
+
+        path = options["checkpoint"]
+        state = _load_checkpoint(path)
+        state.setdefault("done", {})
+        state.setdefault("failed", {})
+
+        pending = list(self._candidates(options, state))
+        if options["limit"]:
+            pending = pending[:options["limit"]]
+
+        self.stdout.write(
+            f"Meetings to process: {len(pending)} | workers: {options['workers']} | "
+            f"rpm: {config.LLM_REQUESTS_PER_MINUTE or '∞'} | tpm: {config.LLM_TOKENS_PER_MINUTE or '∞'}"
+        )
+        if options["dry_run"] or not pending:
+            return
+
+        done = 0
+        failed = 0
+        started = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=max(1, options["workers"]), thread_name_prefix="ai-backfill")
+        futures = {
+            pool.submit(_process, meeting_id, text, options["force"]): (meeting_id, text)
+            for meeting_id, text in pending
+        }
+
+        try:
+            for future in as_completed(futures):
+                meeting_id, text = futures[future]
+                key = str(meeting_id)
+                error = future.result()
+
+                if error:
+                    failed += 1
+                    state["failed"][key] = error
+                    self.stdout.write(self.style.ERROR(f"Meeting {key}: {error}"))
+                else:
+                    done += 1
+                    state["failed"].pop(key, None)
+                    state["done"][key] = cache_key(text)
+
+                # checkpoint after every meeting (rerun resumes from here)
+                _save_checkpoint(path, state)
+
+                finished = done + failed
+                elapsed = time.monotonic() - started
+                eta = elapsed / finished * (len(pending) - finished)
+                self.stdout.write(f"[{finished}/{len(pending)}] ok: {done} failed: {failed} | ETA {eta:.0f}s")
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            _save_checkpoint(path, state)
+            self.stdout.write(self.style.WARNING("Interrupted — run the same command again to resume."))
+            pool.shutdown(wait=True, cancel_futures=True)
+            return
+
+        pool.shutdown(wait=True)
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfill completed ✅ (Generated: {done}, Failed: {failed})")
+        )
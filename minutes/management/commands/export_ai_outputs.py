@@ -0,0 +1,44 @@
+import json
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from minutes.models import AIOutput
+
+
+def _write_atomic(path: Path, data: dict):
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class Command(BaseCommand):
+    help = "Export AIOutput rows as <meeting_id>.json files (same shape as the old outputs/ dumps)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default="outputs", help="Target directory")
+        parser.add_argument("--meeting", type=int, action="append", help="Meeting id (repeatable); default: all")
+
+    def handle(self, *args, **options):
+        target = Path(options["dir"])
+        target.mkdir(parents=True, exist_ok=True)
+
+        outputs = AIOutput.objects.order_by("meeting_id")
+        if options["meeting"]:
+            outputs = outputs.filter(meeting_id__in=options["meeting"])
+
+        count = 0
+        for output in outputs.iterator():
+            _write_atomic(target / f"{output.meeting_id}.json", {
+                "meeting_id": str(output.meeting_id),
+                "summary": output.summary_text,
+                "decisions": output.decisions_json,
+                "created_at": output.generated_at.isoformat() if output.generated_at else None,
+                "model_name": output.model_name,
+                "pipeline_version": output.pipeline_version,
+            })
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} AI outputs to {target} ✅"))
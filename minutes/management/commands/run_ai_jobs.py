@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from minutes.services import ai_jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued AI minutes generation jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when the queue is empty (useful locally / in cron)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            ai_jobs.run_worker(
+                poll_interval=options["poll_interval"],
+                once=options["once"],
+                log=self.stdout.write,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("AI job worker stopped"))
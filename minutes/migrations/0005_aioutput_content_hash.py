@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minutes', '0004_alter_aioutput_options_alter_minutes_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aioutput',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0008_faceverificationjob'),
+        ('minutes', '0006_aijob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AICallLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(db_index=True, max_length=30)),
+                ('backend', models.CharField(blank=True, default='', max_length=20)),
+                ('model_name', models.CharField(blank=True, default='', max_length=100)),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('latency_ms', models.PositiveIntegerField(default=0)),
+                ('retries', models.PositiveSmallIntegerField(default=0)),
+                ('cached', models.BooleanField(default=False)),
+                ('ok', models.BooleanField(default=True)),
+                ('error', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('meeting', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ai_calls', to='meetings.meeting')),
+            ],
+            options={
+                'verbose_name': 'AI Call',
+                'verbose_name_plural': 'AI Calls',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
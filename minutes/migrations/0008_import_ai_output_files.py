@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-17 13:00
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.db import migrations
+
+
+def _output_dirs():
+    # run_pipeline used to write to "outputs/" relative to the process CWD
+    dirs = [Path(settings.BASE_DIR) / "outputs", Path.cwd() / "outputs"]
+    seen = set()
+    for d in dirs:
+        d = d.resolve()
+        if d not in seen and d.is_dir():
+            seen.add(d)
+            yield d
+
+
+def import_output_files(apps, schema_editor):
+    AIOutput = apps.get_model("minutes", "AIOutput")
+    Meeting = apps.get_model("meetings", "Meeting")
+
+    for directory in _output_dirs():
+        for path in sorted(directory.glob("*.json")):
+            meeting_id = path.stem
+            # old test runs used ids like "test-1": no meeting to attach them to
+            if not meeting_id.isdigit() or not Meeting.objects.filter(id=int(meeting_id)).exists():
+                continue
+            if AIOutput.objects.filter(meeting_id=int(meeting_id)).exists():
+                continue
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            decisions = data.get("decisions")
+            AIOutput.objects.create(
+                meeting_id=int(meeting_id),
+                summary_text=data.get("summary") or "",
+                # very old files stored decisions as markdown text
+                decisions_json=decisions if isinstance(decisions, dict) else {},
+                pipeline_version="file-import",
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0001_initial'),
+        ('minutes', '0007_aicalllog'),
+    ]
+
+    operations = [
+        migrations.RunPython(import_output_files, migrations.RunPython.noop),
+    ]
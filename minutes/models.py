@@ -126,6 +126,9 @@ class AIOutput(models.Model):
     model_name = models.CharField(max_length=100, blank=True, default="")
     pipeline_version = models.CharField(max_length=30, blank=True, default="v1")
 
+    # sha256(transcript + model settings + prompt version): reused instead of calling the LLM again
+    content_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+
     generated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -136,3 +139,114 @@ class AIOutput(models.Model):
     def __str__(self):
         title = getattr(self.meeting, "title", str(self.meeting))
         return f"AI Output — {title}"
+
+
+class AIJob(models.Model):
+    """
+    Background AI generation for a meeting's minutes (DB-backed queue).
+    - Enqueued by the minutes page, processed by `manage.py run_ai_jobs`.
+    - idempotency_key = meeting + content hash: clicking twice on the same
+      text reuses the same job instead of queueing a second LLM run.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    meeting = models.ForeignKey(
+        "meetings.Meeting",
+        on_delete=models.CASCADE,
+        related_name="ai_jobs",
+    )
+
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    transcript = models.TextField(blank=True, default="")
+    force = models.BooleanField(default=False)
+
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True, default="")
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ai_jobs",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_after"]
+        verbose_name = "AI Job"
+        verbose_name_plural = "AI Jobs"
+
+    def __str__(self):
+        title = getattr(self.meeting, "title", str(self.meeting))
+        return f"AI Job — {title} ({self.status})"
+
+    @property
+    def is_active(self):
+        return self.status in (self.STATUS_PENDING, self.STATUS_RUNNING)
+
+
+class AICallLog(models.Model):
+    """
+    One row per LLM call / pipeline run / cache hit (ai_meeting_engine
+    instrumentation). Aggregated on the AI metrics page.
+    """
+
+    meeting = models.ForeignKey(
+        "meetings.Meeting",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ai_calls",
+    )
+
+    # summary / summary_chunk / summary_merge / summary_stream / decisions /
+    # combined / combined_chunk / pipeline (end-to-end) / cache (hit)
+    stage = models.CharField(max_length=30, db_index=True)
+    backend = models.CharField(max_length=20, blank=True, default="")
+    model_name = models.CharField(max_length=100, blank=True, default="")
+
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    latency_ms = models.PositiveIntegerField(default=0)
+    retries = models.PositiveSmallIntegerField(default=0)
+
+    cached = models.BooleanField(default=False)
+    ok = models.BooleanField(default=True)
+    error = models.CharField(max_length=255, blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "AI Call"
+        verbose_name_plural = "AI Calls"
+
+    def __str__(self):
+        return f"{self.stage} — {self.latency_ms} ms"
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
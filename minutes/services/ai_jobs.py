@@ -0,0 +1,200 @@
+"""
+DB-backed job queue for AI minutes generation (no external broker).
+
+- enqueue(): called by the minutes page, returns immediately.
+- `manage.py run_ai_jobs` claims jobs with a conditional UPDATE (row-level,
+  works on SQLite and Postgres), runs the pipeline and writes Minutes.
+- Failures / partial results are retried with exponential backoff.
+"""
+
+import json
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from meetings.services.ai_meeting_engine.cache import cache_key
+from meetings.services.ai_meeting_engine.service import run_ai
+from minutes.models import AIJob, Minutes
+
+BACKOFF_SECONDS = 15          # 15s, 30s, 60s, ...
+STALE_AFTER = timedelta(minutes=10)
+
+
+def extract_decisions_payload(result: dict) -> dict:
+    """
+    The structured decisions dict of a run_ai result
+    ({"decisions": [...], "action_items": [...], "risks": [...], "notes": [...]}),
+    or {} when there is none.
+    """
+    if not isinstance(result, dict):
+        return {}
+    payload = result.get("decisions")
+    return payload if isinstance(payload, dict) else {}
+
+
+def apply_ai_result(minutes_obj: Minutes, result: dict):
+    """
+    Copy an AI result into the minutes record.
+    A failed stage (partial result) keeps the previous value.
+    """
+    errors = result.get("errors") or {}
+
+    if "summary" not in errors:
+        minutes_obj.ai_summary = result.get("summary", "")
+        minutes_obj.summary = minutes_obj.ai_summary  # legacy sync
+
+    if "decisions" not in errors:
+        payload = extract_decisions_payload(result)
+
+        # store decisions as JSON string always
+        if payload:
+            minutes_obj.ai_decisions = json.dumps(payload, ensure_ascii=False)
+        else:
+            minutes_obj.ai_decisions = str(result.get("decisions", ""))
+
+    minutes_obj.ai_generated_at = timezone.now()
+
+    minutes_obj.save(update_fields=[
+        "ai_summary",
+        "summary",
+        "ai_decisions",
+        "ai_generated_at",
+        "updated_at"
+    ])
+
+
+# -------------------------
+# Producer
+# -------------------------
+def enqueue(meeting, transcript: str, user=None, force: bool = False) -> AIJob:
+    key = f"{meeting.id}:{cache_key(transcript)}"
+
+    job, created = AIJob.objects.get_or_create(
+        idempotency_key=key,
+        defaults={
+            "meeting": meeting,
+            "transcript": transcript,
+            "force": force,
+            "requested_by": user,
+        },
+    )
+    if created or job.is_active:
+        return job
+
+    if job.status == AIJob.STATUS_DONE and not force:
+        return job
+
+    # finished earlier: run again (explicit regenerate or previous failure)
+    job.status = AIJob.STATUS_PENDING
+    job.force = force
+    job.attempts = 0
+    job.last_error = ""
+    job.run_after = timezone.now()
+    job.requested_by = user
+    job.started_at = None
+    job.finished_at = None
+    job.save()
+    return job
+
+
+def latest_job(meeting):
+    return AIJob.objects.filter(meeting=meeting).order_by("-created_at", "-id").first()
+
+
+# -------------------------
+# Consumer
+# -------------------------
+def claim_next():
+    now = timezone.now()
+    candidates = (
+        AIJob.objects
+        .filter(status=AIJob.STATUS_PENDING, run_after__lte=now)
+        .order_by("run_after")
+        .values_list("id", flat=True)[:20]
+    )
+    for job_id in candidates:
+        claimed = (
+            AIJob.objects
+            .filter(pk=job_id, status=AIJob.STATUS_PENDING)
+            .update(status=AIJob.STATUS_RUNNING, started_at=now)
+        )
+        if claimed:
+            return AIJob.objects.select_related("meeting").get(pk=job_id)
+    return None
+
+
+def process(job: AIJob):
+    job.attempts += 1
+    last_attempt = job.attempts >= job.max_attempts
+
+    try:
+        result = run_ai(str(job.meeting_id), job.transcript, force=job.force)
+        errors = result.get("errors") or {}
+        error = "; ".join(f"{k}: {v}" for k, v in errors.items())
+    except Exception as e:
+        result = None
+        error = str(e) or e.__class__.__name__
+
+    skipped = False
+    if result is not None and (not error or last_attempt):
+        with transaction.atomic():
+            # re-read under lock: the minutes may have been approved while the LLM ran
+            minutes_obj, _ = (
+                Minutes.objects
+                .select_for_update()
+                .get_or_create(meeting=job.meeting, defaults={"created_by": job.requested_by})
+            )
+            skipped = minutes_obj.is_locked
+            if not skipped:
+                apply_ai_result(minutes_obj, result)
+
+    job.last_error = error
+    if skipped:
+        # approved minutes are never overwritten; retrying would not change that
+        job.status = AIJob.STATUS_DONE
+        job.last_error = "Minutes were approved (locked) before the AI finished: result not applied."
+        job.finished_at = timezone.now()
+    elif not error:
+        job.status = AIJob.STATUS_DONE
+        job.finished_at = timezone.now()
+    elif last_attempt:
+        job.status = AIJob.STATUS_FAILED
+        job.finished_at = timezone.now()
+    else:
+        job.status = AIJob.STATUS_PENDING
+        job.run_after = timezone.now() + timedelta(seconds=BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+
+    job.save(update_fields=["attempts", "status", "last_error", "run_after", "finished_at"])
+    return job
+
+
+def requeue_stale():
+    """
+    Jobs left running by a worker that died go back to the queue.
+    """
+    return AIJob.objects.filter(
+        status=AIJob.STATUS_RUNNING,
+        started_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=AIJob.STATUS_PENDING, started_at=None)
+
+
+def run_worker(poll_interval: float = 1.0, once: bool = False, log=print):
+    log("AI job worker started")
+    requeue_stale()
+
+    while True:
+        close_old_connections()
+        job = claim_next()
+
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            requeue_stale()
+            continue
+
+        job = process(job)
+        log(f"Job #{job.id} (meeting {job.meeting_id}): {job.status}"
+            + (f" — {job.last_error}" if job.last_error else ""))
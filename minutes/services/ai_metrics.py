@@ -0,0 +1,137 @@
+"""
+Aggregations over AICallLog for the AI metrics page.
+Percentiles are computed in Python (SQLite has no percentile function).
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from minutes.models import AICallLog
+
+# rows that are not LLM calls
+NON_CALL_STAGES = ("pipeline", "cache", "compress")
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def _latency(rows):
+    latencies = [r["latency_ms"] for r in rows]
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+def _tokens(rows):
+    prompt = sum(r["prompt_tokens"] for r in rows)
+    completion = sum(r["completion_tokens"] for r in rows)
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+    }
+
+
+def build_report(days: int = 14, top_meetings: int = 25) -> dict:
+    since = timezone.now() - timedelta(days=days)
+    rows = list(
+        AICallLog.objects
+        .filter(created_at__gte=since)
+        .values(
+            "meeting_id", "meeting__title", "stage", "prompt_tokens",
+            "completion_tokens", "latency_ms", "retries", "cached", "ok", "created_at",
+        )
+    )
+
+    calls = [r for r in rows if r["stage"] not in NON_CALL_STAGES]
+    runs = [r for r in rows if r["stage"] == "pipeline"]
+    hits = [r for r in rows if r["stage"] == "cache"]
+    # compress rows: prompt_tokens = raw transcript, completion_tokens = compressed
+    compressed = [r for r in rows if r["stage"] == "compress"]
+    raw_tokens = sum(r["prompt_tokens"] for r in compressed)
+    kept_tokens = sum(r["completion_tokens"] for r in compressed)
+
+    # per stage (LLM calls + end-to-end pipeline)
+    stages = defaultdict(list)
+    for r in calls + runs:
+        stages[r["stage"]].append(r)
+    by_stage = [
+        {
+            "stage": stage,
+            "calls": len(items),
+            "failed": sum(1 for r in items if not r["ok"]),
+            "retries": sum(r["retries"] for r in items),
+            **_latency(items),
+            **_tokens(items),
+            "avg_completion": round(sum(r["completion_tokens"] for r in items) / len(items)),
+        }
+        for stage, items in sorted(stages.items())
+    ]
+
+    # per day
+    days_map = defaultdict(list)
+    for r in rows:
+        days_map[timezone.localtime(r["created_at"]).date()].append(r)
+    by_day = []
+    for day, items in sorted(days_map.items(), reverse=True):
+        day_runs = [r for r in items if r["stage"] == "pipeline"]
+        day_calls = [r for r in items if r["stage"] not in NON_CALL_STAGES]
+        by_day.append({
+            "day": day,
+            "runs": len(day_runs),
+            "cache_hits": sum(1 for r in items if r["stage"] == "cache"),
+            "calls": len(day_calls),
+            **_latency(day_runs),
+            **_tokens(day_calls),
+        })
+
+    # per meeting
+    meetings = defaultdict(list)
+    for r in rows:
+        if r["meeting_id"]:
+            meetings[(r["meeting_id"], r["meeting__title"])].append(r)
+    by_meeting = []
+    for (meeting_id, title), items in meetings.items():
+        meeting_runs = [r for r in items if r["stage"] == "pipeline"]
+        meeting_calls = [r for r in items if r["stage"] not in NON_CALL_STAGES]
+        by_meeting.append({
+            "meeting_id": meeting_id,
+            "title": title,
+            "runs": len(meeting_runs),
+            "cache_hits": sum(1 for r in items if r["stage"] == "cache"),
+            "calls": len(meeting_calls),
+            **_latency(meeting_runs),
+            **_tokens(meeting_calls),
+        })
+    by_meeting.sort(key=lambda m: m["total_tokens"], reverse=True)
+
+    lookups = len(runs) + len(hits)
+    return {
+        "days": days,
+        "totals": {
+            "runs": len(runs),
+            "calls": len(calls),
+            "cache_hits": len(hits),
+            "cache_hit_rate": round(100 * len(hits) / lookups) if lookups else 0,
+            "failed_calls": sum(1 for r in calls if not r["ok"]),
+            **_latency(runs),
+            **_tokens(calls),
+        },
+        "compression": {
+            "runs": len(compressed),
+            "raw_tokens": raw_tokens,
+            "kept_tokens": kept_tokens,
+            "ratio": round(100 * kept_tokens / raw_tokens) if raw_tokens else 100,
+        },
+        "by_stage": by_stage,
+        "by_day": by_day,
+        "by_meeting": by_meeting[:top_meetings],
+    }
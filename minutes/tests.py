@@ -1,3 +1,47 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from meetings.models import Meeting
+from .models import Minutes
+
+
+class AIStreamLockTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_user("admin", password="pw", is_staff=True)
+        self.meeting = Meeting.objects.create(
+            title="Budget review",
+            scheduled_at=timezone.now(),
+            organizer=self.admin,
+        )
+        self.minutes = Minutes.objects.create(
+            meeting=self.meeting,
+            created_by=self.admin,
+            discussion_points="Ahmed: we approve the budget.",
+            ai_summary="Approved summary",
+        )
+        self.client.force_login(self.admin)
+
+    def test_minutes_locked_mid_stream_are_not_overwritten(self):
+        minutes_pk = self.minutes.pk
+
+        def fake_stream(meeting_id, text, force=False):
+            yield "New "
+            # approved while the summary is still streaming
+            Minutes.objects.filter(pk=minutes_pk).update(is_locked=True, status=Minutes.STATUS_APPROVED)
+            yield "summary"
+
+        with mock.patch("minutes.views.stream_ai_summary", fake_stream):
+            response = self.client.post(
+                reverse("minutes:ai_stream", args=[self.meeting.id]),
+                {"discussion_points": self.minutes.discussion_points},
+            )
+            body = b"".join(response.streaming_content).decode()
 
-# Create your tests here.
+        self.assertIn("event: error", body)
+        self.assertNotIn("event: done", body)
+        self.minutes.refresh_from_db()
+        self.assertEqual(self.minutes.ai_summary, "Approved summary")
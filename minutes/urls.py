@@ -6,6 +6,9 @@ app_name = "minutes"
 urlpatterns = [
     path("", views.minutes_home, name="home"),
     path("all/", views.minutes_list, name="list"),
+    path("ai-metrics/", views.ai_metrics, name="ai_metrics"),
     path("meeting/<int:meeting_id>/", views.minutes_for_meeting, name="meeting_minutes"),
+    path("meeting/<int:meeting_id>/ai-status/", views.ai_status, name="ai_status"),
+    path("meeting/<int:meeting_id>/ai-stream/", views.ai_stream, name="ai_stream"),
 ]
 
@@ -3,13 +3,20 @@ import ast
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, get_object_or_404, redirect
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.views.decorators.http import require_POST
+from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth import get_user_model
 
 from meetings.models import Meeting
-from .models import Minutes
-from meetings.services.ai_meeting_engine.service import run_ai
+from .models import AIOutput, Minutes
+from .services import ai_jobs
+from .services.ai_metrics import build_report
+from meetings.services.ai_meeting_engine.cache import cache_key
+from meetings.services.ai_meeting_engine.service import cached_ai, run_ai, stream_ai_summary
 
 User = get_user_model()
 
@@ -52,6 +59,11 @@ def _parse_ai_decisions(raw):
     return {}
 
 
+def _sse(data: dict, event: str = "") -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 def _find_user_by_name(name: str):
     if not name:
         return None
@@ -74,38 +86,6 @@ def _find_user_by_name(name: str):
     return None
 
 
-def _extract_decisions_payload(result: dict) -> dict:
-    """
-    Normalizes AI engine output to a single dict:
-    Expected schema:
-    {
-      "decisions": [...],
-      "action_items": [...],
-      "risks": [...],
-      "notes": [...]
-    }
-    Your extractor returns: {"meeting_id": ..., "output": {...}}
-    So this function returns the inner "output".
-    """
-    if not isinstance(result, dict):
-        return {}
-
-    # case 1: run_ai returns {"output": {...}}
-    if isinstance(result.get("output"), dict):
-        return result["output"]
-
-    # case 2: run_ai returns {"decisions": {"output": {...}}}
-    dec = result.get("decisions")
-    if isinstance(dec, dict) and isinstance(dec.get("output"), dict):
-        return dec["output"]
-
-    # case 3: run_ai returns {"decisions": {...}} directly
-    if isinstance(dec, dict) and ("action_items" in dec or "decisions" in dec):
-        return dec
-
-    return {}
-
-
 @login_required
 def minutes_home(request):
     return render(request, "minutes/minutes_home.html")
@@ -150,7 +130,7 @@ def minutes_for_meeting(request, meeting_id):
             return redirect("minutes:meeting_minutes", meeting_id=meeting.id)
 
         # ✅ Only capture manual text for actions that actually edit it
-        if action in ("save", "generate_ai"):
+        if action in ("save", "generate_ai", "regenerate_ai"):
             minutes_obj.discussion_points = request.POST.get("discussion_points", "")
 
         if action == "save":
@@ -158,31 +138,32 @@ def minutes_for_meeting(request, meeting_id):
             messages.success(request, "Minutes saved.")
             return redirect("minutes:meeting_minutes", meeting_id=meeting.id)
 
-        if action == "generate_ai":
-            result = run_ai(str(meeting.id), minutes_obj.discussion_points)
+        if action in ("generate_ai", "regenerate_ai"):
+            # regenerate_ai skips the content-hash cache and always calls the LLM
+            force = action == "regenerate_ai"
+            minutes_obj.save(update_fields=["discussion_points", "updated_at"])
+
+            result = None if force else cached_ai(str(meeting.id), minutes_obj.discussion_points)
+
+            if result is None and settings.AI_JOBS_ENABLED:
+                # LLM call runs in `manage.py run_ai_jobs`; the page polls ai_status
+                ai_jobs.enqueue(meeting, minutes_obj.discussion_points, user=request.user, force=force)
+                messages.info(request, "AI generation started — this page will update when it finishes.")
+                return redirect("minutes:meeting_minutes", meeting_id=meeting.id)
 
-            minutes_obj.ai_summary = result.get("summary", "")
+            if result is None:
+                result = run_ai(str(meeting.id), minutes_obj.discussion_points, force=force)
 
-            payload = _extract_decisions_payload(result)
+            ai_jobs.apply_ai_result(minutes_obj, result)
 
-            # store decisions as JSON string always
-            if payload:
-                minutes_obj.ai_decisions = json.dumps(payload, ensure_ascii=False)
+            errors = result.get("errors") or {}
+            if errors:
+                failed = ", ".join(sorted(errors))
+                messages.warning(request, f"AI output is partial ({failed} failed). Try generating again.")
+            elif result.get("cached"):
+                messages.success(request, "Minutes unchanged — AI summary & decisions loaded from cache.")
             else:
-                minutes_obj.ai_decisions = str(result.get("decisions", ""))
-
-            minutes_obj.ai_generated_at = timezone.now()
-            minutes_obj.summary = minutes_obj.ai_summary  # legacy sync
-
-            minutes_obj.save(update_fields=[
-                "discussion_points",
-                "ai_summary",
-                "summary",
-                "ai_decisions",
-                "ai_generated_at",
-                "updated_at"
-            ])
-            messages.success(request, "AI summary & decisions generated.")
+                messages.success(request, "AI summary & decisions generated.")
             return redirect("minutes:meeting_minutes", meeting_id=meeting.id)
 
         if action == "send_to_review":
@@ -211,7 +192,13 @@ def minutes_for_meeting(request, meeting_id):
                 messages.error(request, "Approve the minutes first before generating tasks.")
                 return redirect("minutes:meeting_minutes", meeting_id=meeting.id)
 
+            # tasks come from the decisions that were approved with the minutes;
+            # AIOutput is only trusted when it was generated from the same text
             data = _parse_ai_decisions(minutes_obj.ai_decisions)
+            if not data:
+                ai_output = AIOutput.objects.filter(meeting=meeting).only("decisions_json", "content_hash").first()
+                if ai_output and ai_output.decisions_json and ai_output.content_hash == cache_key(minutes_obj.discussion_points):
+                    data = ai_output.decisions_json
 
             action_items = data.get("action_items") or data.get("tasks") or data.get("actions") or []
             if not action_items:
@@ -265,4 +252,108 @@ def minutes_for_meeting(request, meeting_id):
     return render(request, "minutes/meeting_minutes.html", {
         "meeting": meeting,
         "minutes": minutes_obj,
+        "ai_job": ai_jobs.latest_job(meeting),
+    })
+
+
+@login_required
+def ai_status(request, meeting_id):
+    """
+    JSON status of the latest AI job (polled by the minutes page).
+    """
+    meeting = get_object_or_404(Meeting, pk=meeting_id)
+
+    if not _is_admin(request.user):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+
+    job = ai_jobs.latest_job(meeting)
+    if job is None:
+        return JsonResponse({"status": "none"})
+
+    return JsonResponse({
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.last_error,
+    })
+
+
+@login_required
+@require_POST
+def ai_stream(request, meeting_id):
+    """
+    Streams the AI summary as server-sent events:
+      data: {"delta": "..."}            (repeated)
+      event: done  data: {"summary": "..."}
+      event: error data: {"error": "..."}
+    The final text is saved to Minutes.ai_summary (and AIOutput), unless
+    the minutes were approved (locked) in the meantime.
+    """
+    meeting = get_object_or_404(Meeting, pk=meeting_id)
+
+    if not _is_admin(request.user):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+
+    minutes_obj, _ = Minutes.objects.get_or_create(
+        meeting=meeting,
+        defaults={"created_by": request.user}
+    )
+    if minutes_obj.is_locked:
+        return JsonResponse({"error": "This minutes record is approved and locked."}, status=400)
+
+    minutes_obj.discussion_points = request.POST.get("discussion_points", minutes_obj.discussion_points)
+    minutes_obj.save(update_fields=["discussion_points", "updated_at"])
+
+    force = request.POST.get("force") == "1"
+
+    def events():
+        parts = []
+        try:
+            for delta in stream_ai_summary(str(meeting.id), minutes_obj.discussion_points, force=force):
+                parts.append(delta)
+                yield _sse({"delta": delta})
+        except Exception as e:
+            yield _sse({"error": str(e) or e.__class__.__name__}, event="error")
+            return
+
+        summary = "".join(parts)
+        with transaction.atomic():
+            # re-read under lock: the minutes may have been approved while streaming
+            current = Minutes.objects.select_for_update().get(pk=minutes_obj.pk)
+            locked = current.is_locked
+            if not locked:
+                current.ai_summary = summary
+                current.summary = summary  # legacy sync
+                current.ai_generated_at = timezone.now()
+                current.save(update_fields=["ai_summary", "summary", "ai_generated_at", "updated_at"])
+
+        if locked:
+            yield _sse({"error": "The minutes were approved while the summary was generated; it was not saved."}, event="error")
+            return
+
+        yield _sse({"summary": summary}, event="done")
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: do not buffer the stream
+    return response
+
+
+@login_required
+def ai_metrics(request):
+    """
+    Token / latency report over AICallLog (admins only).
+    """
+    if not _is_admin(request.user):
+        messages.error(request, "You are not allowed to view AI metrics.")
+        return redirect("minutes:list")
+
+    try:
+        days = int(request.GET.get("days", 14))
+    except ValueError:
+        days = 14
+    days = min(max(days, 1), 90)
+
+    return render(request, "minutes/ai_metrics.html", {
+        "report": build_report(days),
     })
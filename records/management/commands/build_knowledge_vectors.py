@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from records.models import KnowledgeChunk
+from records.services import embeddings, vector_index
+
+
+class Command(BaseCommand):
+    help = "Embed KnowledgeChunk texts and build the assistant's vector (IVF) index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=embeddings.BATCH_SIZE)
+        parser.add_argument("--nlist", type=int, default=0, help="IVF lists (0 = auto from the chunk count)")
+        parser.add_argument("--full", action="store_true", help="Re-embed every chunk (ignore the current index)")
+
+    def _previous(self, model, full):
+        """
+        (current index, chunk id -> row) when its vectors can be reused.
+        """
+        if full:
+            return None
+        index = vector_index.load()
+        if index is None or index.model != model:
+            return None
+        return index, {int(cid): row for row, cid in enumerate(index.ids)}
+
+    def handle(self, *args, **options):
+        try:
+            encoder = embeddings.get_encoder()
+        except ImportError:
+            raise CommandError("sentence-transformers is not installed (pip install sentence-transformers)")
+
+        started = time.monotonic()
+        previous = self._previous(encoder.name, options["full"])
+
+        rows = list(KnowledgeChunk.objects.order_by("id").values_list("id", "text").iterator(chunk_size=2000))
+        count = len(rows)
+        ids = np.empty(count, dtype=np.int64)
+        hashes = np.empty(count, dtype=np.uint64)
+        vectors = np.empty((count, encoder.dim), dtype=np.float32)
+
+        pending = []   # (position, text) still to embed
+        reused = 0
+        for pos, (chunk_id, text) in enumerate(rows):
+            ids[pos] = chunk_id
+            hashes[pos] = vector_index.text_hash(encoder.name, text)
+            if previous is not None:
+                index, positions = previous
+                row = positions.get(chunk_id)
+                if row is not None and int(index.hashes[row]) == int(hashes[pos]):
+                    vectors[pos] = index.vectors[row]
+                    reused += 1
+                    continue
+            pending.append((pos, text or ""))
+
+        self.stdout.write(f"Chunks: {count} | reused: {reused} | to embed: {len(pending)} | model: {encoder.name}")
+
+        batch_size = max(1, options["batch_size"])
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            vectors[[pos for pos, _ in batch]] = encoder.encode([text for _, text in batch], batch_size=batch_size)
+            done = start + len(batch)
+            if done % (batch_size * 50) == 0 or done == len(pending):
+                self.stdout.write(f"  embedded {done}/{len(pending)}")
+
+        meta = vector_index.build(ids, vectors, hashes, encoder.name, nlist=options["nlist"] or None)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Vector index built ✅ (Chunks: {meta['count']}, Lists: {meta['nlist']}, "
+                f"Generation: {meta['generation']}, {time.monotonic() - started:.1f}s)"
+            )
+        )
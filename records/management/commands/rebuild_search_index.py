@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from records.models import KnowledgeChunk
+from records.services import search_index
+
+
+class Command(BaseCommand):
+    help = "Repopulate the KnowledgeChunk full-text index (FTS5 / tsvector)"
+
+    def handle(self, *args, **options):
+        if not search_index.rebuild():
+            raise CommandError("This database has no full-text index (SQLite or PostgreSQL only)")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Search index rebuilt ✅ (Chunks: {KnowledgeChunk.objects.count()})")
+        )
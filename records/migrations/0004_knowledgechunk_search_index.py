@@ -0,0 +1,147 @@
+# Generated by Django 6.0 on 2026-10-17 14:00
+
+from django.db import migrations
+
+# Full-text index over KnowledgeChunk (queried by records.services.search_index),
+# kept in sync by triggers.
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS records_knowledgechunk_fts USING fts5(
+        text, title, tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS records_knowledgechunk_fts_ai
+    AFTER INSERT ON records_knowledgechunk BEGIN
+        INSERT INTO records_knowledgechunk_fts (rowid, text, title)
+        VALUES (new.id, new.text,
+                (SELECT title FROM records_knowledgedocument WHERE id = new.document_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS records_knowledgechunk_fts_ad
+    AFTER DELETE ON records_knowledgechunk BEGIN
+        DELETE FROM records_knowledgechunk_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS records_knowledgechunk_fts_au
+    AFTER UPDATE OF text, document_id ON records_knowledgechunk BEGIN
+        UPDATE records_knowledgechunk_fts
+        SET text = new.text,
+            title = (SELECT title FROM records_knowledgedocument WHERE id = new.document_id)
+        WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS records_knowledgedocument_fts_au
+    AFTER UPDATE OF title ON records_knowledgedocument BEGIN
+        UPDATE records_knowledgechunk_fts SET title = new.title
+        WHERE rowid IN (SELECT id FROM records_knowledgechunk WHERE document_id = new.id);
+    END
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS records_knowledgedocument_fts_au",
+    "DROP TRIGGER IF EXISTS records_knowledgechunk_fts_au",
+    "DROP TRIGGER IF EXISTS records_knowledgechunk_fts_ad",
+    "DROP TRIGGER IF EXISTS records_knowledgechunk_fts_ai",
+    "DROP TABLE IF EXISTS records_knowledgechunk_fts",
+]
+
+SQLITE_REBUILD = [
+    "DELETE FROM records_knowledgechunk_fts",
+    """
+    INSERT INTO records_knowledgechunk_fts (rowid, text, title)
+    SELECT c.id, c.text, d.title
+    FROM records_knowledgechunk c
+    JOIN records_knowledgedocument d ON d.id = c.document_id
+    """,
+    "INSERT INTO records_knowledgechunk_fts (records_knowledgechunk_fts) VALUES ('optimize')",
+]
+
+# 'simple' config: the archive mixes Arabic and English
+POSTGRES_INSTALL = [
+    "ALTER TABLE records_knowledgechunk ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION records_knowledgechunk_tsv() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(
+                (SELECT title FROM records_knowledgedocument WHERE id = NEW.document_id), ''
+            )), 'A')
+            || setweight(to_tsvector('simple', coalesce(NEW.text, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS records_knowledgechunk_tsv_trg ON records_knowledgechunk",
+    """
+    CREATE TRIGGER records_knowledgechunk_tsv_trg
+    BEFORE INSERT OR UPDATE OF text, document_id ON records_knowledgechunk
+    FOR EACH ROW EXECUTE FUNCTION records_knowledgechunk_tsv()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION records_knowledgedocument_tsv() RETURNS trigger AS $$
+    BEGIN
+        UPDATE records_knowledgechunk SET text = text WHERE document_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS records_knowledgedocument_tsv_trg ON records_knowledgedocument",
+    """
+    CREATE TRIGGER records_knowledgedocument_tsv_trg
+    AFTER UPDATE OF title ON records_knowledgedocument
+    FOR EACH ROW EXECUTE FUNCTION records_knowledgedocument_tsv()
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS records_knowledgechunk_search_gin
+    ON records_knowledgechunk USING GIN (search_vector)
+    """,
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS records_knowledgedocument_tsv_trg ON records_knowledgedocument",
+    "DROP TRIGGER IF EXISTS records_knowledgechunk_tsv_trg ON records_knowledgechunk",
+    "DROP FUNCTION IF EXISTS records_knowledgedocument_tsv()",
+    "DROP FUNCTION IF EXISTS records_knowledgechunk_tsv()",
+    "DROP INDEX IF EXISTS records_knowledgechunk_search_gin",
+    "ALTER TABLE records_knowledgechunk DROP COLUMN IF EXISTS search_vector",
+]
+
+POSTGRES_REBUILD = [
+    # fires the BEFORE UPDATE trigger for every row
+    "UPDATE records_knowledgechunk SET text = text",
+]
+
+
+STATEMENTS = {
+    "sqlite": (SQLITE_INSTALL + SQLITE_REBUILD, SQLITE_UNINSTALL),
+    "postgresql": (POSTGRES_INSTALL + POSTGRES_REBUILD, POSTGRES_UNINSTALL),
+}
+
+
+def install_index(apps, schema_editor):
+    install, _ = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for sql in install:
+        schema_editor.execute(sql)
+
+
+def uninstall_index(apps, schema_editor):
+    _, uninstall = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for sql in uninstall:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0003_knowledgedocument_knowledgechunk'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, uninstall_index),
+    ]
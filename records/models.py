@@ -75,7 +75,7 @@ class KnowledgeChunk(models.Model):
     chunk_index = models.PositiveIntegerField()
     text = models.TextField()
 
-    # نخليه اختياري الآن (نفعّله لاحقًا لما نضيف embeddings)
+    # غير مستخدم: الـ embeddings تنحفظ float32 في vector_index (manage.py build_knowledge_vectors)
     embedding = models.JSONField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
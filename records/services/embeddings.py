@@ -0,0 +1,131 @@
+"""
+Sentence embeddings for KnowledgeChunk (assistant dense retrieval).
+
+- settings.KNOWLEDGE_EMBEDDING_MODEL names a sentence-transformers model
+  (multilingual by default: the archive mixes Arabic and English). It is
+  loaded once per process and encodes in batches on CPU.
+- "hashing" selects a deterministic offline encoder (feature hashing of
+  words and word pairs): no download, no semantics, for dev and tests.
+
+All vectors are L2-normalized float32, so cosine similarity = dot product.
+
+settings.ASSISTANT_RERANK_MODEL optionally names a cross-encoder that
+rescores (question, chunk) pairs for the assistant's top candidates.
+"""
+
+import hashlib
+import re
+import threading
+
+import numpy as np
+
+BATCH_SIZE = 64
+HASHING_DIM = 384
+
+_encoder = None
+_reranker = None
+_lock = threading.Lock()
+
+
+def _model_name():
+    from django.conf import settings
+    return settings.KNOWLEDGE_EMBEDDING_MODEL
+
+
+def _normalize_rows(matrix) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+class SentenceEncoder:
+    def __init__(self, model_name: str):
+        # optional dependency: only needed where embeddings are built / queried
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+
+    def encode(self, texts, batch_size: int = BATCH_SIZE) -> np.ndarray:
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return _normalize_rows(vectors)
+
+
+class HashingEncoder:
+    TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.name = "hashing"
+        self.dim = dim
+
+    def _features(self, text):
+        words = self.TOKEN_RE.findall((text or "").lower())
+        yield from words
+        yield from (f"{a} {b}" for a, b in zip(words, words[1:]))
+
+    def encode(self, texts, batch_size: int = BATCH_SIZE) -> np.ndarray:
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                matrix[row, h % self.dim] += 1.0 if (h >> 63) else -1.0
+        return _normalize_rows(matrix)
+
+
+def get_encoder():
+    """
+    Process-wide encoder (the model is loaded on first use).
+    Raises ImportError if sentence-transformers is not installed.
+    """
+    global _encoder
+    name = _model_name()
+    if _encoder is not None and _encoder.name == name:
+        return _encoder
+
+    with _lock:
+        if _encoder is None or _encoder.name != name:
+            _encoder = HashingEncoder() if name == "hashing" else SentenceEncoder(name)
+    return _encoder
+
+
+class Reranker:
+    def __init__(self, model_name: str):
+        from sentence_transformers import CrossEncoder
+
+        self.name = model_name
+        self.model = CrossEncoder(model_name, device="cpu")
+
+    def score(self, query: str, texts, batch_size: int = BATCH_SIZE) -> np.ndarray:
+        pairs = [(query, text) for text in texts]
+        if not pairs:
+            return np.empty(0, dtype=np.float32)
+        return np.asarray(self.model.predict(pairs, batch_size=batch_size, show_progress_bar=False), dtype=np.float32)
+
+
+def get_reranker():
+    """
+    Process-wide cross-encoder, or None when reranking is off.
+    Raises ImportError if sentence-transformers is not installed.
+    """
+    from django.conf import settings
+
+    global _reranker
+    name = settings.ASSISTANT_RERANK_MODEL
+    if not name:
+        return None
+    if _reranker is not None and _reranker.name == name:
+        return _reranker
+
+    with _lock:
+        if _reranker is None or _reranker.name != name:
+            _reranker = Reranker(name)
+    return _reranker
@@ -0,0 +1,194 @@
+"""
+Full-text index over KnowledgeChunk (text + document title).
+
+- SQLite: FTS5 table `records_knowledgechunk_fts` (rowid = chunk id),
+  ranked with bm25(); snippet() (far more expensive per row) is built
+  only for the k best rows. bm25() cost grows with the rows it scores,
+  so terms found in most chunks ("decision", "priority" in every seed
+  document) are left out of ranking once the rarer terms already fill
+  POSTINGS_BUDGET; when every term is that common, only the
+  RECENT_CANDIDATES most recent matches are ranked. bm25() also reads
+  each term's whole posting list once per query for its IDF, which no
+  budget bounds (~10 ms for a term in every chunk of a 60k-chunk index).
+- PostgreSQL: `search_vector` tsvector column + GIN index, ranked with
+  ts_rank_cd(), snippets with ts_headline().
+
+Both are kept in sync by database triggers, so bulk_create / queryset
+deletes / cascades never leave the index stale. The DDL is installed by
+records.0004; `manage.py rebuild_search_index` repopulates it.
+"""
+
+import re
+
+from django.db import connection
+from django.db.utils import DatabaseError
+
+FTS_TABLE = "records_knowledgechunk_fts"
+TITLE_WEIGHT = 5.0       # bm25 column weight of the title vs the chunk text (1.0)
+SNIPPET_TOKENS = 48      # FTS5 snippet window (max 64)
+MAX_TERMS = 12
+POSTINGS_BUDGET = 10000  # rows bm25() may score per query (~3 µs each, plus its IDF pass)
+RECENT_CANDIDATES = 2000  # chunks ranked when every term is in most chunks
+
+# كلمات شائعة نرميها
+STOP_WORDS = {
+    "what", "is", "are", "was", "the", "a", "an", "please", "tell", "me", "about", "give",
+    "show", "for", "of", "to", "in", "on", "and", "or", "with", "did", "do", "we", "our",
+    "why", "how", "who", "when", "which",
+}
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+SQLITE_REBUILD = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, text, title)
+    SELECT c.id, c.text, d.title
+    FROM records_knowledgechunk c
+    JOIN records_knowledgedocument d ON d.id = c.document_id
+    """,
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')",
+]
+
+POSTGRES_REBUILD = [
+    # fires the BEFORE UPDATE trigger for every row
+    "UPDATE records_knowledgechunk SET text = text",
+]
+
+
+REBUILD = {
+    "sqlite": SQLITE_REBUILD,
+    "postgresql": POSTGRES_REBUILD,
+}
+
+
+def rebuild() -> bool:
+    """
+    Repopulate the index from KnowledgeChunk. False if this database has none.
+    """
+    statements = REBUILD.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+    return bool(statements)
+
+
+def query_terms(query: str):
+    terms = [t for t in TERM_RE.findall((query or "").lower()) if t not in STOP_WORDS]
+    # dedupe, keep order
+    return list(dict.fromkeys(terms))[:MAX_TERMS]
+
+
+def _fts_match(terms):
+    return ['"{}"'.format(t.replace('"', "")) for t in terms]
+
+
+def _sqlite_postings(cursor, term):
+    """
+    Chunks containing `term`, counted up to POSTINGS_BUDGET + 1 (bounded cost).
+    """
+    cursor.execute(
+        f"SELECT count(*) FROM (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT %s)",
+        [_fts_match([term])[0], POSTINGS_BUDGET + 1],
+    )
+    return cursor.fetchone()[0]
+
+
+def _sqlite_search(cursor, terms, k):
+    counts = {t: _sqlite_postings(cursor, t) for t in terms}
+    terms = sorted((t for t in terms if counts[t]), key=lambda t: counts[t])
+    if not terms:
+        return []
+
+    # rarest terms first, while their postings fit the budget
+    ranked_terms, postings = [], 0
+    for term in terms:
+        if ranked_terms and postings + counts[term] > POSTINGS_BUDGET:
+            break
+        ranked_terms.append(term)
+        postings += counts[term]
+
+    # terms are OR-ed; BM25 ranks chunks matching more / rarer terms higher
+    first = 0  # lowest rowid ranked (chunk ids start at 1)
+    if postings > POSTINGS_BUDGET:
+        # even the rarest term is in most chunks (little IDF): rank only the
+        # RECENT_CANDIDATES most recent matches of all terms (a rowid range)
+        ranked_terms = terms
+        cursor.execute(
+            f"""
+            SELECT min(rowid) FROM (
+                SELECT rowid FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH %s
+                ORDER BY rowid DESC
+                LIMIT %s
+            )
+            """,
+            [" OR ".join(_fts_match(ranked_terms)), RECENT_CANDIDATES],
+        )
+        first = cursor.fetchone()[0] or 0
+
+    match = " OR ".join(_fts_match(ranked_terms))
+    ranked = f"""
+        SELECT rowid, -bm25({FTS_TABLE}, 1.0, %s) AS score
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH %s AND rowid >= %s
+        ORDER BY bm25({FTS_TABLE}, 1.0, %s)
+        LIMIT %s
+    """
+    params = [TITLE_WEIGHT, match, first, TITLE_WEIGHT, k]
+
+    # snippet() is the expensive part: only build it for the k hits
+    # (rowid lookup under the same MATCH)
+    cursor.execute(
+        f"""
+        SELECT hit.rowid, hit.score, snippet({FTS_TABLE}, 0, '', '', ' … ', %s)
+        FROM ({ranked}) hit
+        JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = hit.rowid
+        WHERE {FTS_TABLE} MATCH %s
+        ORDER BY hit.score DESC
+        """,
+        [SNIPPET_TOKENS, *params, match],
+    )
+    return cursor.fetchall()
+
+
+def _postgres_search(cursor, terms, k):
+    tsquery = " | ".join(terms)
+    cursor.execute(
+        """
+        SELECT hit.id, hit.score,
+               ts_headline('simple', hit.text, to_tsquery('simple', %s),
+                           'StartSel="", StopSel="", MaxWords=60, MinWords=25, MaxFragments=2')
+        FROM (
+            SELECT c.id, c.text, ts_rank_cd(c.search_vector, q) AS score
+            FROM records_knowledgechunk c, to_tsquery('simple', %s) q
+            WHERE c.search_vector @@ q
+            ORDER BY score DESC
+            LIMIT %s
+        ) hit
+        ORDER BY hit.score DESC
+        """,
+        [tsquery, tsquery, k],
+    )
+    return cursor.fetchall()
+
+
+def search(query: str, k: int = 5):
+    """
+    [(chunk_id, score, snippet)] best first (higher score = more relevant).
+    Raises DatabaseError when the index is missing, or when the query is
+    only stop words (nothing to match): the caller falls back to a plain
+    text match on the raw query.
+    """
+    terms = query_terms(query)
+    if not terms:
+        raise DatabaseError("No searchable terms in the query")
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            rows = _sqlite_search(cursor, terms, k)
+        elif connection.vendor == "postgresql":
+            rows = _postgres_search(cursor, terms, k)
+        else:
+            raise DatabaseError(f"No full-text index for {connection.vendor}")
+    return [(row[0], float(row[1]), row[2]) for row in rows]
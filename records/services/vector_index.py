@@ -0,0 +1,268 @@
+"""
+Approximate nearest-neighbour index over KnowledgeChunk embeddings.
+
+Built offline by `manage.py build_knowledge_vectors` into
+settings.KNOWLEDGE_VECTOR_DIR:
+
+- g<generation>/vectors.npy   : float32 (N, dim), L2-normalized, rows grouped by IVF list
+- g<generation>/ids.npy       : int64 chunk id of every row
+- g<generation>/hashes.npy    : uint64 text hash of every row (incremental rebuilds)
+- g<generation>/centroids.npy : float32 (nlist, dim) spherical k-means centroids
+- g<generation>/offsets.npy   : int64 (nlist + 1) row range of every list
+- CURRENT.json                : {version, model, dim, generation, count, nlist}
+
+A build writes a new generation directory and then swaps CURRENT.json,
+so readers never see a half-written index. Workers memory-map the arrays
+read-only (pages shared between processes).
+
+Search (IVF): score the centroids, then only the rows of the `nprobe`
+closest lists, which are contiguous slices of the matrix. Small indexes
+(one list) are searched exactly.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+INDEX_VERSION = 1
+CURRENT_FILE = "CURRENT.json"
+
+EXACT_MAX_ROWS = 20000     # below this one list (exact search) beats IVF
+NPROBE = 32                # lists scanned per query
+KMEANS_SAMPLE = 65536      # rows used to train the centroids
+KMEANS_ITERATIONS = 12
+ASSIGN_BATCH = 65536
+RELOAD_CHECK_SECONDS = 30  # how often workers look for a newer generation
+
+_index = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def index_dir() -> Path:
+    from django.conf import settings
+    return Path(settings.KNOWLEDGE_VECTOR_DIR)
+
+
+def text_hash(model: str, text: str) -> int:
+    digest = hashlib.blake2b(f"{model}\n{text or ''}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+# -------------------------
+# Build
+# -------------------------
+def default_nlist(count: int) -> int:
+    if count <= EXACT_MAX_ROWS:
+        return 1
+    return int(min(4096, 4 * np.sqrt(count)))
+
+
+def _assign(vectors, centroids) -> np.ndarray:
+    labels = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], ASSIGN_BATCH):
+        block = vectors[start:start + ASSIGN_BATCH]
+        labels[start:start + ASSIGN_BATCH] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors, nlist: int, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means (cosine) on a sample of the rows.
+    """
+    rng = np.random.default_rng(seed)
+    count = vectors.shape[0]
+    sample = vectors[rng.choice(count, size=min(count, KMEANS_SAMPLE), replace=False)]
+    nlist = min(nlist, sample.shape[0])
+
+    centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        sizes = np.bincount(labels, minlength=nlist)
+
+        empty = np.flatnonzero(sizes == 0)
+        if empty.size:
+            # re-seed empty lists with random rows
+            sums[empty] = sample[rng.choice(sample.shape[0], size=empty.size, replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return np.ascontiguousarray(centroids)
+
+
+def _save(path: Path, array):
+    tmp = path.with_suffix(".npy.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def build(ids, vectors, hashes, model: str, nlist: int = None) -> dict:
+    """
+    Write a new generation and make it current. Returns its metadata.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    count = vectors.shape[0]
+
+    nlist = max(1, min(nlist or default_nlist(count), count or 1))
+    if nlist > 1:
+        centroids = train_centroids(vectors, nlist)
+        nlist = centroids.shape[0]
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        sizes = np.bincount(labels, minlength=nlist)
+    else:
+        mean = vectors.mean(axis=0, keepdims=True) if count else np.zeros((1, vectors.shape[1]), np.float32)
+        centroids = np.ascontiguousarray(mean, dtype=np.float32)
+        order = np.arange(count)
+        sizes = np.array([count])
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    root = index_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    current = read_current() or {}
+    generation = int(current.get("generation", 0)) + 1
+    gen_dir = root / f"g{generation:06d}"
+    gen_dir.mkdir(exist_ok=True)
+
+    _save(gen_dir / "vectors.npy", vectors[order])
+    _save(gen_dir / "ids.npy", ids[order])
+    _save(gen_dir / "hashes.npy", hashes[order])
+    _save(gen_dir / "centroids.npy", centroids)
+    _save(gen_dir / "offsets.npy", offsets)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "model": model,
+        "dim": int(vectors.shape[1]),
+        "generation": generation,
+        "path": gen_dir.name,
+        "count": int(count),
+        "nlist": int(nlist),
+    }
+    tmp = root / f"{CURRENT_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, root / CURRENT_FILE)
+
+    # keep the previous generation for workers that still map it
+    for old in sorted(root.glob("g*")):
+        if old.is_dir() and old.name not in (gen_dir.name, current.get("path")):
+            shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+# -------------------------
+# Load / search
+# -------------------------
+class VectorIndex:
+    def __init__(self, meta, ids, vectors, hashes, centroids, offsets):
+        self.meta = meta
+        self.ids = ids
+        self.vectors = vectors
+        self.hashes = hashes
+        self.centroids = centroids
+        self.offsets = offsets
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    @property
+    def model(self):
+        return self.meta["model"]
+
+    def search(self, query, k: int = 5, nprobe: int = NPROBE):
+        """
+        Up to k (chunk_id, cosine similarity) pairs, best first.
+        `query` must be L2-normalized (same encoder as the index).
+        """
+        if not len(self):
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+
+        nlist = self.centroids.shape[0]
+        if nlist <= 1 or nprobe >= nlist:
+            rows = None
+            scores = self.vectors @ query
+        else:
+            closest = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            ranges = [(self.offsets[l], self.offsets[l + 1]) for l in closest]
+            rows = np.concatenate([np.arange(a, b) for a, b in ranges])
+            scores = np.concatenate([self.vectors[a:b] @ query for a, b in ranges])
+            if not scores.size:
+                return []
+
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k] if k < scores.shape[0] else np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            row = int(i) if rows is None else int(rows[i])
+            results.append((int(self.ids[row]), float(scores[i])))
+        return results
+
+
+def read_current():
+    path = index_dir() / CURRENT_FILE
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load(mmap: bool = True):
+    """
+    The current index (memory-mapped, read-only) or None if there is none.
+    """
+    meta = read_current()
+    if not meta or meta.get("version") != INDEX_VERSION:
+        return None
+
+    gen_dir = index_dir() / meta["path"]
+    mode = "r" if mmap else None
+    try:
+        arrays = {
+            name: np.load(gen_dir / f"{name}.npy", mmap_mode=mode)
+            for name in ("ids", "vectors", "hashes", "centroids", "offsets")
+        }
+    except (OSError, ValueError):
+        return None
+
+    if arrays["vectors"].shape[0] != arrays["ids"].shape[0]:
+        return None
+    # small arrays: keep them in memory
+    arrays["centroids"] = np.ascontiguousarray(arrays["centroids"])
+    arrays["offsets"] = np.asarray(arrays["offsets"])
+    return VectorIndex(meta, **arrays)
+
+
+def get_index():
+    """
+    Process-wide index; picks up a newer generation at most every
+    RELOAD_CHECK_SECONDS.
+    """
+    global _index, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _index
+
+    with _lock:
+        if now - _checked_at >= RELOAD_CHECK_SECONDS:
+            meta = read_current()
+            generation = meta.get("generation") if meta else None
+            if _index is None or _index.meta.get("generation") != generation:
+                _index = load()
+            _checked_at = now
+    return _index